@@ -14,15 +14,17 @@ from enum import Enum, auto
 from src import (
     Browser,
     Login,
-    MorePromotions,
-    PunchCards,
     Searches,
     ReadToEarn,
-    DailySet,
+    ActivityPlanner,
     Account,
 )
 from src.browser import RemainingSearches
+from src.commandCounter import CommandCounter
+from src.config import CONFIG
 from src.loggingColoredFormatter import ColoredFormatter
+from src.runJournal import RunJournal
+from src.tracer import Tracer
 from src.utils import Utils
 
 
@@ -37,7 +39,13 @@ def main():
 
     for currentAccount in loadedAccounts:
         try:
-            earned_points = executeBot(currentAccount, args)
+            journal = RunJournal.forAccount(currentAccount.username, args.resume)
+            if journal.finished:
+                logging.info(
+                    f"[RESUME] '{currentAccount.username}' is already done today, skipping"
+                )
+                continue
+            earned_points = executeBot(currentAccount, args, journal)
         except Exception as e1:
             logging.error("", exc_info=True)
             Utils.sendNotification(
@@ -59,11 +67,14 @@ def main():
         logging.info(
             f"[POINTS] Data for '{currentAccount.username}' appended to the file."
         )
+        journal.markFinished()
 
     # Save the current day's points data for the next day in the "logs" folder
     save_previous_points_data(previous_points_data)
     logging.info("[POINTS] Data saved for the next day.")
 
+    logging.info(f"[TIMING] Time spent per phase:\n{Tracer.getSummary()}")
+
 
 def log_daily_points_to_csv(earned_points, points_difference):
     logs_directory = Utils.getProjectRoot() / "logs"
@@ -96,6 +107,7 @@ def setupLogging():
 
     logs_directory = Utils.getProjectRoot() / "logs"
     logs_directory.mkdir(parents=True, exist_ok=True)
+    Tracer.setTraceFile(logs_directory / "trace.jsonl")
 
     # so only our code is logged if level=logging.DEBUG or finer
     # if not working see https://stackoverflow.com/a/48891485/4164390
@@ -165,6 +177,18 @@ def argumentParser() -> argparse.Namespace:
         default=None,
         help="Optional: Set to only search in either desktop or mobile (ex: 'desktop' or 'mobile')",
     )
+    parser.add_argument(
+        "-sb",
+        "--single-browser",
+        action="store_true",
+        help="Optional: Use a single browser for both desktop and mobile, switching its emulated device",
+    )
+    parser.add_argument(
+        "-r",
+        "--resume",
+        action="store_true",
+        help="Optional: Resume today's run of each account, skipping the work already done",
+    )
     return parser.parse_args()
 
 
@@ -222,67 +246,70 @@ class AppriseSummary(Enum):
     """
 
 
-def executeBot(currentAccount: Account, args: argparse.Namespace):
+def executeBot(
+    currentAccount: Account,
+    args: argparse.Namespace,
+    journal: RunJournal | None = None,
+):
     logging.info(f"********************{currentAccount.username}********************")
+    Tracer.context = {"account": currentAccount.username}
+    if journal is None:
+        journal = RunJournal.forAccount(currentAccount.username, args.resume)
 
-    startingPoints: int | None = None
     accountPoints: int
     remainingSearches: RemainingSearches
     goalTitle: str
     goalPoints: int
-
-    if args.searchtype in ("desktop", None):
+    commandCounters: list[CommandCounter] = []
+
+    # Both phases in the same browser, the mobile one just switches the emulated device
+    singleBrowser = args.single_browser and args.searchtype is None
+    runDesktop = args.searchtype in ("desktop", None)
+    runMobile = args.searchtype in ("mobile", None) and not singleBrowser
+    if runDesktop and runMobile and journal.isDone(*DESKTOP_PHASES):
+        # The mobile browser is enough to get the status at the end
+        logging.info("[RESUME] Desktop already done, skipping")
+        runDesktop = False
+
+    if runDesktop:
         with Browser(mobile=False, account=currentAccount, args=args) as desktopBrowser:
-            utils = desktopBrowser.utils
-            Login(desktopBrowser, args).login()
-            startingPoints = utils.getAccountPoints()
-            logging.info(
-                f"[POINTS] You have {utils.formatNumber(startingPoints)} points on your account"
+            executeDesktop(desktopBrowser, args, journal)
+            if singleBrowser:
+                desktopBrowser.switchPersona(mobile=True)
+                executeMobile(desktopBrowser, args, journal)
+            goalPoints, goalTitle, remainingSearches, accountPoints = getStatus(
+                desktopBrowser
             )
-            # todo Combine these classes so main loop isn't duplicated
-            DailySet(desktopBrowser).completeDailySet()
-            PunchCards(desktopBrowser).completePunchCards()
-            MorePromotions(desktopBrowser).completeMorePromotions()
-            # VersusGame(desktopBrowser).completeVersusGame()
-
-            with Searches(desktopBrowser) as searches:
-                searches.bingSearches()
-
-            goalPoints = utils.getGoalPoints()
-            goalTitle = utils.getGoalTitle()
+        commandCounters.append(desktopBrowser.commandCounter)
 
-            remainingSearches = desktopBrowser.getRemainingSearches(
-                desktopAndMobile=True
-            )
-            accountPoints = utils.getAccountPoints()
-
-    if args.searchtype in ("mobile", None):
+    if runMobile:
         with Browser(mobile=True, account=currentAccount, args=args) as mobileBrowser:
-            utils = mobileBrowser.utils
-            Login(mobileBrowser, args).login()
-            if startingPoints is None:
-                startingPoints = utils.getAccountPoints()
-            ReadToEarn(mobileBrowser).completeReadToEarn()
-            with Searches(mobileBrowser) as searches:
-                searches.bingSearches()
-
-            goalPoints = utils.getGoalPoints()
-            goalTitle = utils.getGoalTitle()
-
-            remainingSearches = mobileBrowser.getRemainingSearches(
-                desktopAndMobile=True
+            executeMobile(mobileBrowser, args, journal)
+            goalPoints, goalTitle, remainingSearches, accountPoints = getStatus(
+                mobileBrowser
             )
-            accountPoints = utils.getAccountPoints()
+        commandCounters.append(mobileBrowser.commandCounter)
 
+    # Kept from the first run of the day when resuming, so the whole day's points are counted
+    startingPoints = journal.startingPoints
+    if startingPoints is None:
+        logging.warning(
+            "[POINTS] Starting points weren't recorded, counting from the current points"
+        )
+        startingPoints = accountPoints
     logging.info(
         f"[POINTS] You have earned {Utils.formatNumber(accountPoints - startingPoints)} points this run !"
     )
     logging.info(
         f"[POINTS] You are now at {Utils.formatNumber(accountPoints)} points !"
     )
-    appriseSummary = AppriseSummary[
-        Utils.loadConfig().get("apprise", {}).get("summary", AppriseSummary.ALWAYS.name)
-    ]
+    commandCounts = ""
+    if CONFIG.appriseCommandCounts:
+        commandCounts = (
+            "🧮 Commands per module:\n"
+            + CommandCounter.formatCounts(CommandCounter.merge(commandCounters))
+        )
+    appriseSummary = AppriseSummary[CONFIG.appriseSummary]
     if appriseSummary == AppriseSummary.ALWAYS:
         goalStatus = ""
         if goalPoints > 0:
@@ -303,6 +330,7 @@ def executeBot(currentAccount: Account, args: argparse.Namespace):
                     f"⭐️ Points earned today: {Utils.formatNumber(accountPoints - startingPoints)}",
                     f"💰 Total points: {Utils.formatNumber(accountPoints)}",
                     goalStatus,
+                    commandCounts,
                 ]
             ),
         )
@@ -310,7 +338,12 @@ def executeBot(currentAccount: Account, args: argparse.Namespace):
         if remainingSearches.getTotal() > 0:
             Utils.sendNotification(
                 "Error: remaining searches",
-                f"account username: {currentAccount.username}, {remainingSearches}",
+                "\n".join(
+                    [
+                        f"account username: {currentAccount.username}, {remainingSearches}",
+                        commandCounts,
+                    ]
+                ),
             )
     elif appriseSummary == AppriseSummary.NEVER:
         pass
@@ -318,6 +351,59 @@ def executeBot(currentAccount: Account, args: argparse.Namespace):
     return accountPoints
 
 
+DESKTOP_PHASES = ("desktopActivities", "desktopSearches")
+
+
+def executeDesktop(
+    desktopBrowser: Browser, args: argparse.Namespace, journal: RunJournal
+) -> None:
+    Login(desktopBrowser, args).login()
+    recordStartingPoints(desktopBrowser, journal)
+    if not journal.isDone("desktopActivities"):
+        # Failed activities are left for a resumed run to retry
+        if ActivityPlanner(desktopBrowser, journal).completeActivities():
+            journal.markDone("desktopActivities")
+        # VersusGame(desktopBrowser).completeVersusGame()
+
+    if not journal.isDone("desktopSearches"):
+        with Searches(desktopBrowser) as searches:
+            searches.bingSearches()
+        journal.markDone("desktopSearches")
+
+
+def executeMobile(
+    mobileBrowser: Browser, args: argparse.Namespace, journal: RunJournal
+) -> None:
+    Login(mobileBrowser, args).login()
+    recordStartingPoints(mobileBrowser, journal)
+    if not journal.isDone("mobileReadToEarn"):
+        ReadToEarn(mobileBrowser).completeReadToEarn()
+        journal.markDone("mobileReadToEarn")
+    if not journal.isDone("mobileSearches"):
+        with Searches(mobileBrowser) as searches:
+            searches.bingSearches()
+        journal.markDone("mobileSearches")
+
+
+def recordStartingPoints(browser: Browser, journal: RunJournal) -> None:
+    if journal.startingPoints is not None:
+        return
+    utils = browser.utils
+    journal.startingPoints = utils.getAccountPoints()
+    logging.info(
+        f"[POINTS] You have {utils.formatNumber(journal.startingPoints)} points on your account"
+    )
+
+
+def getStatus(browser: Browser) -> tuple[int, str, RemainingSearches, int]:
+    utils = browser.utils
+    goalPoints = utils.getGoalPoints()
+    goalTitle = utils.getGoalTitle()
+    remainingSearches = browser.getRemainingSearches(desktopAndMobile=True)
+    accountPoints = utils.getAccountPoints()
+    return goalPoints, goalTitle, remainingSearches, accountPoints
+
+
 def export_points_to_csv(points_data):
     logs_directory = Utils.getProjectRoot() / "logs"
     csv_filename = logs_directory / "points_data.csv"
@@ -7,3 +7,4 @@ from .morePromotions import MorePromotions
 from .punchCards import PunchCards
 from .readToEarn import ReadToEarn
 from .searches import Searches
+from .activityPlanner import ActivityPlanner
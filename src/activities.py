@@ -4,15 +4,16 @@ import time
 
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
 
 from src.browser import Browser
+from src.quizEngine import QuizEngine
 
 
 class Activities:
     def __init__(self, browser: Browser):
         self.browser = browser
         self.webdriver = browser.webdriver
+        self.quizEngine = QuizEngine(browser)
 
     def openDailySetActivity(self, cardId: int):
         # Open the Daily Set activity for the given cardId
@@ -48,44 +49,14 @@ class Activities:
         self.browser.utils.waitUntilVisible(
             By.ID, "overlayPanel", 5
         )
-        currentQuestionNumber: int = self.webdriver.execute_script(
-            "return _w.rewardsQuizRenderInfo.currentQuestionNumber"
-        )
-        maxQuestions = self.webdriver.execute_script(
-            "return _w.rewardsQuizRenderInfo.maxQuestions"
-        )
-        numberOfOptions = self.webdriver.execute_script(
-            "return _w.rewardsQuizRenderInfo.numberOfOptions"
-        )
-        for _ in range(currentQuestionNumber, maxQuestions + 1):
-            if numberOfOptions == 8:
-                answers = []
-                for i in range(numberOfOptions):
-                    isCorrectOption = self.webdriver.find_element(
-                        By.ID, f"rqAnswerOption{i}"
-                    ).get_attribute("iscorrectoption")
-                    if isCorrectOption and isCorrectOption.lower() == "true":
-                        answers.append(f"rqAnswerOption{i}")
-                for answer in answers:
-                    element = self.webdriver.find_element(By.ID, answer)
-                    self.browser.utils.click(element)
-                    self.browser.utils.waitUntilQuestionRefresh()
-            elif numberOfOptions in [2, 3, 4]:
-                correctOption = self.webdriver.execute_script(
-                    "return _w.rewardsQuizRenderInfo.correctAnswer"
-                )
-                for i in range(numberOfOptions):
-                    if (
-                        self.webdriver.find_element(
-                            By.ID, f"rqAnswerOption{i}"
-                        ).get_attribute("data-option")
-                        == correctOption
-                    ):
-                        element = self.webdriver.find_element(By.ID, f"rqAnswerOption{i}")
-                        self.browser.utils.click(element)
-
-                        self.browser.utils.waitUntilQuestionRefresh()
-                        break
+        state = self.quizEngine.readState()
+        firstQuestion = state.currentQuestionNumber
+        for question in range(firstQuestion, state.maxQuestions + 1):
+            if question != firstQuestion:
+                state = self.quizEngine.readState()
+            for optionId in state.getTargets():
+                self.quizEngine.clickOption(optionId)
+                self.browser.utils.waitUntilQuestionRefresh()
         self.browser.utils.closeCurrentTab()
 
     def completeABC(self):
@@ -113,29 +84,10 @@ class Activities:
         )
         time.sleep(random.randint(10, 15))
         for _ in range(10):
-            correctAnswerCode = self.webdriver.execute_script(
-                "return _w.rewardsQuizRenderInfo.correctAnswer"
-            )
-            answer1, answer1Code = self.getAnswerAndCode("rqAnswerOption0")
-            answer2, answer2Code = self.getAnswerAndCode("rqAnswerOption1")
-            answerToClick: WebElement
-            if answer1Code == correctAnswerCode:
-                answerToClick = answer1
-            elif answer2Code == correctAnswerCode:
-                answerToClick = answer2
-
-            self.browser.utils.click(answerToClick)
+            optionId = self.quizEngine.readState().getThisOrThatTarget()
+            assert optionId is not None, "No answer matches the correct answer code"
+            self.quizEngine.clickOption(optionId)
             time.sleep(random.randint(10, 15))
 
         time.sleep(random.randint(10, 15))
         self.browser.utils.closeCurrentTab()
-
-    def getAnswerAndCode(self, answerId: str) -> tuple[WebElement, str]:
-        # Helper function to get answer element and its code
-        answerEncodeKey = self.webdriver.execute_script("return _G.IG")
-        answer = self.webdriver.find_element(By.ID, answerId)
-        answerTitle = answer.get_attribute("data-option")
-        return (
-            answer,
-            self.browser.utils.getAnswerCode(answerEncodeKey, answerTitle),
-        )
@@ -0,0 +1,240 @@
+import logging
+import urllib.parse
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum, auto
+
+from src.browser import Browser
+from src.commandCounter import CommandCounter
+from src.tracer import Tracer
+
+from .constants import REWARDS_URL
+from .dailySet import DailySet
+from .morePromotions import MorePromotions
+from .punchCards import PunchCards
+from .runJournal import RunJournal
+
+
+class ActivityCategory(Enum):
+    DAILY_SET = auto()
+    PROMOTIONAL_ITEM = auto()
+    MORE_PROMOTIONS = auto()
+    PUNCH_CARD = auto()
+    """
+    the only category not opened from a card of the rewards page
+    """
+
+
+# Module each category's commands are counted for, the one completing its activities
+CATEGORY_MODULES = {
+    ActivityCategory.DAILY_SET: "dailySet",
+    ActivityCategory.PROMOTIONAL_ITEM: "punchCards",
+    ActivityCategory.MORE_PROMOTIONS: "morePromotions",
+    ActivityCategory.PUNCH_CARD: "punchCards",
+}
+# Often not clickable, so their failures are only logged at debug and don't leave the plan unfinished
+FLAKY_CATEGORIES = {ActivityCategory.PROMOTIONAL_ITEM}
+
+
+@dataclass
+class ActivityTask:
+    category: ActivityCategory
+    offerId: str
+    title: str
+    destinationUrl: str
+    cardId: int
+    """
+    position of the activity's card on the rewards page, as the activity opens it
+    """
+    promotion: dict = field(repr=False)
+    """
+    the promotion as in the dashboard
+    """
+
+    @property
+    def id(self) -> str:
+        # Some punch cards come without an offerId, their destination tells them apart
+        return f"{self.category.name}:{self.offerId or self.destinationUrl}"
+
+    @property
+    def host(self) -> str:
+        return urllib.parse.urlparse(self.destinationUrl).netloc
+
+    @property
+    def startsFromRewards(self) -> bool:
+        return self.category != ActivityCategory.PUNCH_CARD
+
+
+class ActivityPlanner:
+    """
+    Plans every pending activity from a single dashboard snapshot then completes them, instead
+    of each category scanning the dashboard on its own.
+
+    Activities opened from the rewards page come first so it's only loaded once, then the tasks
+    are grouped by the host they lead to.
+    """
+
+    def __init__(self, browser: Browser, journal: RunJournal | None = None):
+        self.browser = browser
+        self.journal = journal
+        """
+        when given, completed tasks are recorded and the ones already there skipped
+        """
+        self.dailySet = DailySet(browser)
+        self.punchCards = PunchCards(browser)
+        self.morePromotions = MorePromotions(browser)
+
+    @Tracer.traced
+    def completeActivities(self) -> bool:
+        logging.info("[ACTIVITIES] Planning activities...")
+        tasks = ActivityPlanner.plan(self.browser.utils.getDashboardData())
+        if self.journal:
+            tasks = [task for task in tasks if not self.journal.isTaskDone(task.id)]
+        logging.info(f"[ACTIVITIES] {len(tasks)} pending activities")
+        allCompleted = self.runPlan(tasks)
+        self.browser.utils.invalidateDashboardData()
+        MorePromotions.notifyIncompletePromotions(
+            self.browser.utils.getDashboardData()["morePromotions"]
+        )
+        logging.info("[ACTIVITIES] Exiting")
+        return allCompleted
+
+    def runPlan(self, tasks: list[ActivityTask]) -> bool:
+        """Completes the tasks in order, returns whether none of them failed, flaky ones aside."""
+        allCompleted = True
+        for task in tasks:
+            # One span name per category, so each gets its own row in the timing summary
+            with Tracer.span(
+                f"ActivityPlanner {task.category.name}", offerId=task.offerId
+            ), CommandCounter.creditTo(CATEGORY_MODULES[task.category]):
+                try:
+                    if task.startsFromRewards:
+                        self.browser.utils.ensureOnRewards()
+                    self.completeTask(task)
+                    if self.journal:
+                        self.journal.markTaskDone(task.id)
+                except Exception:  # pylint: disable=broad-except
+                    flaky = task.category in FLAKY_CATEGORIES
+                    allCompleted = allCompleted and flaky
+                    logging.log(
+                        logging.DEBUG if flaky else logging.ERROR,
+                        f"[ACTIVITIES] Error completing {task.category.name} {task.title}",
+                        exc_info=True,
+                    )
+                    # Reset tabs in case of an exception
+                    self.browser.utils.resetTabs()
+                finally:
+                    # Activities load many pages, the performance log mustn't pile up meanwhile
+                    self.browser.collectResourceStats()
+        return allCompleted
+
+    def completeTask(self, task: ActivityTask) -> None:
+        logging.debug(f"task={task}")
+        if task.category == ActivityCategory.DAILY_SET:
+            self.dailySet.completeDailySetActivity(task.cardId, task.promotion)
+        elif task.category == ActivityCategory.PROMOTIONAL_ITEM:
+            self.punchCards.completePromotionalItem()
+        elif task.category == ActivityCategory.MORE_PROMOTIONS:
+            self.morePromotions.completeMorePromotion(task.cardId, task.promotion)
+        elif task.category == ActivityCategory.PUNCH_CARD:
+            self.punchCards.completePunchCard(
+                task.destinationUrl, task.promotion["childPromotions"]
+            )
+        else:
+            raise AssertionError(task.category)
+
+    @staticmethod
+    def plan(dashboard: dict) -> list[ActivityTask]:
+        """Returns the activities left to complete in the order they should be done."""
+        tasks = [
+            *ActivityPlanner.planDailySet(dashboard),
+            *ActivityPlanner.planPromotionalItem(dashboard),
+            *ActivityPlanner.planMorePromotions(dashboard),
+            *ActivityPlanner.planPunchCards(dashboard),
+        ]
+        planned: list[ActivityTask] = []
+        for startsFromRewards in (True, False):
+            # Hosts keep the order they first appear in, so does the dashboard within a host
+            tasksByHost: dict[str, list[ActivityTask]] = {}
+            for task in tasks:
+                if task.startsFromRewards == startsFromRewards:
+                    tasksByHost.setdefault(task.host, []).append(task)
+            for hostTasks in tasksByHost.values():
+                planned.extend(hostTasks)
+        return planned
+
+    @staticmethod
+    def planDailySet(dashboard: dict) -> list[ActivityTask]:
+        todayDate = datetime.now().strftime("%m/%d/%Y")
+        return [
+            ActivityTask(
+                ActivityCategory.DAILY_SET,
+                activity["offerId"],
+                activity["title"],
+                activity["destinationUrl"],
+                int(activity["offerId"][-1:]),
+                activity,
+            )
+            for activity in dashboard["dailySetPromotions"].get(todayDate, [])
+            if activity["complete"] is False
+        ]
+
+    @staticmethod
+    def planPromotionalItem(dashboard: dict) -> list[ActivityTask]:
+        item = dashboard.get("promotionalItem")
+        if not item:
+            return []
+        destUrl = urllib.parse.urlparse(item["destinationUrl"])
+        baseUrl = urllib.parse.urlparse(REWARDS_URL)
+        if (
+            (item["pointProgressMax"] in [100, 200, 500])
+            and not item["complete"]
+            and (
+                (destUrl.hostname == baseUrl.hostname and destUrl.path == baseUrl.path)
+                or destUrl.hostname == "www.bing.com"
+            )
+        ):
+            return [
+                ActivityTask(
+                    ActivityCategory.PROMOTIONAL_ITEM,
+                    item["offerId"],
+                    item["title"],
+                    item["destinationUrl"],
+                    0,
+                    item,
+                )
+            ]
+        return []
+
+    @staticmethod
+    def planMorePromotions(dashboard: dict) -> list[ActivityTask]:
+        return [
+            ActivityTask(
+                ActivityCategory.MORE_PROMOTIONS,
+                promotion["offerId"],
+                promotion["title"],
+                promotion["destinationUrl"],
+                cardId,
+                promotion,
+            )
+            for cardId, promotion in enumerate(dashboard["morePromotions"])
+            if promotion["complete"] is False and promotion["pointProgressMax"] != 0
+        ]
+
+    @staticmethod
+    def planPunchCards(dashboard: dict) -> list[ActivityTask]:
+        return [
+            ActivityTask(
+                ActivityCategory.PUNCH_CARD,
+                punchCard["parentPromotion"].get("offerId", ""),
+                punchCard["parentPromotion"].get("title", ""),
+                punchCard["parentPromotion"]["attributes"]["destination"],
+                0,
+                punchCard,
+            )
+            for punchCard in dashboard["punchCards"]
+            if punchCard["parentPromotion"]
+            and punchCard["childPromotions"]
+            and not punchCard["parentPromotion"]["complete"]
+            and punchCard["parentPromotion"]["pointProgressMax"] != 0
+        ]
@@ -1,27 +1,55 @@
 import argparse
+import contextlib
 import logging
+import os
 import random
+import re
+import subprocess
 from pathlib import Path
 from types import TracebackType
 from typing import Any, Type
 
 import ipapi
-import seleniumwire.undetected_chromedriver as webdriver
 import undetected_chromedriver
 from ipapi.exceptions import RateLimited
 from selenium.webdriver import ChromeOptions
 from selenium.webdriver.chrome.webdriver import WebDriver
 
 from src import Account, RemainingSearches
+from src.commandCounter import CommandCounter
+from src.config import CONFIG
+from src.resourceBlocker import ResourceBlocker
+from src.tracer import Tracer
 from src.userAgentGenerator import GenerateUserAgent
 from src.utils import Utils
 
+# Same patch undetected_chromedriver applies to headless tabs, for tabs opened afterwards
+HIDE_WEBDRIVER_SCRIPT = """
+Object.defineProperty(window, "navigator", {
+    value: new Proxy(navigator, {
+        has: (target, key) => (key === "webdriver" ? false : key in target),
+        get: (target, key) =>
+            key === "webdriver"
+                ? false
+                : typeof target[key] === "function"
+                ? target[key].bind(target)
+                : target[key],
+    }),
+});
+"""
+
 
 class Browser:
     """WebDriver wrapper class."""
 
     webdriver: undetected_chromedriver.Chrome
 
+    captureScopes = [r".*/rewardsapp/reportActivity.*"]
+    """
+    requests selenium-wire keeps, when it's used
+    """
+
+    @Tracer.traced
     def __init__(
         self, mobile: bool, account: Account, args: argparse.Namespace
     ) -> None:
@@ -34,6 +62,7 @@ class Browser:
         self.password = account.password
         self.totp = account.totp
         self.localeLang, self.localeGeo = self.getCCodeLang(args.lang, args.geo)
+        self.chromeVersion: int | None = args.chromeversion
         self.proxy = None
         if args.proxy:
             self.proxy = args.proxy
@@ -41,16 +70,17 @@ class Browser:
             self.proxy = account.proxy
         self.userDataDir = self.setupProfiles()
         self.browserConfig = Utils.getBrowserConfig(self.userDataDir)
-        (
-            self.userAgent,
-            self.userAgentMetadata,
-            newBrowserConfig,
-        ) = GenerateUserAgent().userAgent(self.browserConfig, mobile)
-        if newBrowserConfig:
-            self.browserConfig = newBrowserConfig
-            Utils.saveBrowserConfig(self.userDataDir, self.browserConfig)
+        self.commandCounter = CommandCounter()
+        self.requestsSession = Utils.makeRequestsSession()
+        self.commandCounter.instrumentSession(self.requestsSession)
+        self.resourceBlocker: ResourceBlocker | None = None
+        if CONFIG.blockingEnabled:
+            self.resourceBlocker = ResourceBlocker(
+                CONFIG.blockingPatterns, CONFIG.blockingAllowlist, CONFIG.blockingStats
+            )
+        self.setupUserAgent()
         self.webdriver = self.browserSetup()
-        self.utils = Utils(self.webdriver)
+        self.utils = Utils(self.webdriver, self.requestsSession)
         logging.debug("out __init__")
 
     def __enter__(self):
@@ -67,9 +97,69 @@ class Browser:
         logging.debug(
             f"in __exit__ exc_type={exc_type} exc_value={exc_value} traceback={traceback}"
         )
+        if self.resourceBlocker and self.resourceBlocker.collectsStats:
+            with contextlib.suppress(Exception):
+                self.collectResourceStats()
+            logging.info(f"[BROWSER] Resources: {self.resourceBlocker.getSummary()}")
+        logging.info(
+            f"[BROWSER] Commands:\n{CommandCounter.formatCounts(self.commandCounter.counts)}"
+        )
         # turns out close is needed for undetected_chromedriver
         self.webdriver.close()
         self.webdriver.quit()
+        self.requestsSession.close()
+
+    def setupUserAgent(self) -> None:
+        (
+            self.userAgent,
+            self.userAgentMetadata,
+            newBrowserConfig,
+        ) = GenerateUserAgent(self.requestsSession).userAgent(
+            self.browserConfig, self.mobile
+        )
+        if newBrowserConfig:
+            self.browserConfig = newBrowserConfig
+            Utils.saveBrowserConfig(self.userDataDir, self.browserConfig)
+
+    @Tracer.traced
+    def switchPersona(self, mobile: bool) -> None:
+        """
+        Switches the running browser between desktop and mobile by emulating the other device
+        in a new tab, instead of launching another browser.
+        """
+        logging.info(f"[BROWSER] Switching to {'mobile' if mobile else 'desktop'}")
+        self.mobile = mobile
+        self.browserType = "mobile" if mobile else "desktop"
+        self.setupUserAgent()
+        previousHandle = self.webdriver.current_window_handle
+        self.webdriver.switch_to.new_window("tab")
+        newHandle = self.webdriver.current_window_handle
+        self.webdriver.switch_to.window(previousHandle)
+        with contextlib.suppress(Exception):
+            self.collectResourceStats()
+        self.webdriver.close()
+        self.webdriver.switch_to.window(newHandle)
+        self.utils.tabs.setMainTab(newHandle)
+        self.setupEmulation(self.webdriver)
+        self.ensureWebdriverHidden()
+        self.utils.invalidateDashboardData()
+
+    def ensureWebdriverHidden(self) -> None:
+        """Checks navigator.webdriver is hidden in the current tab before it loads anything."""
+        if not self.webdriver.execute_script("return navigator.webdriver"):
+            return
+        logging.debug("[BROWSER] navigator.webdriver is exposed in the new tab, hiding it")
+        self.webdriver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_SCRIPT}
+        )
+        self.webdriver.get("about:blank")
+        if self.webdriver.execute_script("return navigator.webdriver"):
+            raise RuntimeError("navigator.webdriver is still exposed after switching persona")
+
+    def collectResourceStats(self) -> None:
+        """Empties the performance log into the resource blocker's stats, call it regularly."""
+        if self.resourceBlocker and self.resourceBlocker.collectsStats:
+            self.resourceBlocker.collectStats(self.webdriver)
 
     def browserSetup(
         self,
@@ -91,8 +181,55 @@ class Browser:
         options.add_argument("--disable-features=Translate")
         options.add_argument("--disable-features=PrivacySandboxSettings4")
         options.add_argument("--disable-search-engine-choice-screen") #153
+        if self.resourceBlocker and self.resourceBlocker.collectsStats:
+            # Lets the resource blocker tally blocked requests, only network events are logged
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option(
+                "perfLoggingPrefs", {"enableNetwork": True, "enablePage": False}
+            )
+
+        driver = self.createDriver(options)
+        self.commandCounter.instrumentWebdriver(driver)
 
-        seleniumwireOptions: dict[str, Any] = {"verify_ssl": False}
+        self.setupEmulation(driver)
+
+        return driver
+
+    def useSeleniumWire(self) -> bool:
+        mode = CONFIG.browserSeleniumWire
+        if mode == "always":
+            return True
+        if mode == "never":
+            return False
+        # Its proxy is only needed for authenticated proxies, Chrome handles plain ones itself
+        return self.proxy is not None
+
+    def createDriver(
+        self, options: undetected_chromedriver.ChromeOptions
+    ) -> undetected_chromedriver.Chrome:
+        # Obtain webdriver chrome driver version
+        major = self.chromeVersion or int(self.getChromeVersion().split(".")[0])
+
+        if not self.useSeleniumWire():
+            if self.proxy:
+                logging.warning(
+                    "[BROWSER] selenium-wire disabled, proxy authentication isn't supported"
+                )
+                options.add_argument(f"--proxy-server={self.proxy}")
+            return undetected_chromedriver.Chrome(
+                options=options,
+                user_data_dir=self.userDataDir.as_posix(),
+                version_main=major,
+            )
+
+        # Only imported when needed, it starts a local proxy re-encrypting all the traffic
+        import seleniumwire.undetected_chromedriver as webdriver
+
+        seleniumwireOptions: dict[str, Any] = {
+            "verify_ssl": False,
+            "request_storage": "memory",
+            "request_storage_max_size": CONFIG.browserRequestStorageMaxSize,
+        }
 
         if self.proxy:
             # Setup proxy if provided
@@ -102,23 +239,26 @@ class Browser:
                 "no_proxy": "localhost,127.0.0.1",
             }
 
-        # Obtain webdriver chrome driver version
-        version = self.getChromeVersion()
-        major = int(version.split(".")[0])
-
         driver = webdriver.Chrome(
             options=options,
             seleniumwire_options=seleniumwireOptions,
             user_data_dir=self.userDataDir.as_posix(),
             version_main=major,
         )
+        # Other requests still go through the proxy but aren't kept
+        driver.scopes = self.captureScopes
 
         seleniumLogger = logging.getLogger("seleniumwire")
         seleniumLogger.setLevel(logging.ERROR)
 
-        if self.browserConfig.get("sizes"):
-            deviceHeight = self.browserConfig["sizes"]["height"]
-            deviceWidth = self.browserConfig["sizes"]["width"]
+        return driver
+
+    def setupEmulation(self, driver: undetected_chromedriver.Chrome) -> None:
+        # Desktop and mobile each keep their own sizes so switching persona doesn't mix them
+        sizesKey = "mobileSizes" if self.mobile else "sizes"
+        if self.browserConfig.get(sizesKey):
+            deviceHeight = self.browserConfig[sizesKey]["height"]
+            deviceWidth = self.browserConfig[sizesKey]["width"]
         else:
             if self.mobile:
                 deviceHeight = random.randint(568, 1024)
@@ -126,7 +266,7 @@ class Browser:
             else:
                 deviceWidth = random.randint(1024, 2560)
                 deviceHeight = random.randint(768, min(1440, int(deviceWidth * 0.8)))
-            self.browserConfig["sizes"] = {
+            self.browserConfig[sizesKey] = {
                 "height": deviceHeight,
                 "width": deviceWidth,
             }
@@ -142,13 +282,13 @@ class Browser:
         logging.info(f"Screen size: {screenWidth}x{screenHeight}")
         logging.info(f"Device size: {deviceWidth}x{deviceHeight}")
 
-        if self.mobile:
-            driver.execute_cdp_cmd(
-                "Emulation.setTouchEmulationEnabled",
-                {
-                    "enabled": True,
-                },
-            )
+        # Also sent for desktop, to turn touch back off after switching persona
+        driver.execute_cdp_cmd(
+            "Emulation.setTouchEmulationEnabled",
+            {
+                "enabled": self.mobile,
+            },
+        )
 
         driver.execute_cdp_cmd(
             "Emulation.setDeviceMetricsOverride",
@@ -180,7 +320,8 @@ class Browser:
             },
         )
 
-        return driver
+        if self.resourceBlocker:
+            self.resourceBlocker.apply(driver)
 
     def setupProfiles(self) -> Path:
         """
@@ -216,6 +357,54 @@ class Browser:
 
     @staticmethod
     def getChromeVersion() -> str:
+        """
+        Returns the installed Chrome version, read from the binary without launching it and
+        cached on disk until the binary changes.
+        """
+        binary = undetected_chromedriver.find_chrome_executable()
+        if binary is None:
+            return Browser.probeChromeVersion()
+        binaryMtime = os.path.getmtime(binary)
+        cached = Utils.loadCache("chrome_version")
+        if (
+            cached
+            and cached.get("binary") == binary
+            and cached.get("mtime") == binaryMtime
+        ):
+            return cached["version"]
+        version = Browser.readChromeVersion(binary) or Browser.probeChromeVersion()
+        Utils.saveCache(
+            "chrome_version",
+            {"binary": binary, "mtime": binaryMtime, "version": version},
+        )
+        return version
+
+    @staticmethod
+    def readChromeVersion(binary: str) -> str | None:
+        versionPattern = re.compile(r"\d+\.\d+\.\d+\.\d+")
+        if os.name == "nt":
+            # chrome.exe --version prints nothing on Windows, but its folder has one per version
+            versions = [
+                entry.name
+                for entry in Path(binary).parent.iterdir()
+                if entry.is_dir() and versionPattern.fullmatch(entry.name)
+            ]
+            if versions:
+                return max(versions, key=lambda v: tuple(map(int, v.split("."))))
+            return None
+        try:
+            output = subprocess.run(
+                [binary, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            logging.debug("", exc_info=True)
+            return None
+        if match := versionPattern.search(output):
+            return match.group()
+        return None
+
+    @staticmethod
+    def probeChromeVersion() -> str:
         chrome_options = ChromeOptions()
         chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--no-sandbox")
@@ -231,9 +420,9 @@ class Browser:
     def getRemainingSearches(
             self, desktopAndMobile: bool = False
     ) -> RemainingSearches | int:
-        dashboard = self.utils.getDashboardData()
+        userStatus = self.utils.getUserStatus()
         searchPoints = 1
-        counters = dashboard["userStatus"]["counters"]
+        counters = userStatus["counters"]
 
         progressDesktop = counters["pcSearch"][0]["pointProgress"]
         targetDesktop = counters["pcSearch"][0]["pointProgressMax"]
@@ -246,7 +435,7 @@ class Browser:
             searchPoints = 5
         remainingDesktop = int((targetDesktop - progressDesktop) / searchPoints)
         remainingMobile = 0
-        if dashboard["userStatus"]["levelInfo"]["activeLevel"] != "Level1":
+        if userStatus["levelInfo"]["activeLevel"] != "Level1":
             progressMobile = counters["mobileSearch"][0]["pointProgress"]
             targetMobile = counters["mobileSearch"][0]["pointProgressMax"]
             remainingMobile = int((targetMobile - progressMobile) / searchPoints)
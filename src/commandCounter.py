@@ -0,0 +1,127 @@
+import contextlib
+import sys
+import threading
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from requests import Session
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# WebDriver commands counted and what they're reported as, every call goes through execute
+COUNTED_COMMANDS = {
+    "get": "get",
+    "w3cExecuteScript": "execute_script",
+    "w3cExecuteScriptAsync": "execute_script",
+    "findElement": "find_element",
+    "findElements": "find_element",
+    "findChildElement": "find_element",
+    "findChildElements": "find_element",
+    "executeCdpCommand": "cdp",
+}
+REPORTED_COMMANDS = ["get", "execute_script", "find_element", "cdp", "requests"]
+SRC_DIR = Path(__file__).parent
+# Helpers calls are made through, the module using them is credited instead
+PASS_THROUGH_MODULES = {
+    "activities",
+    "activityPlanner",
+    "browser",
+    "commandCounter",
+    "messageDismisser",
+    "quizEngine",
+    "resourceBlocker",
+    "tabManager",
+    "tracer",
+    "utils",
+}
+
+
+class CommandCounter:
+    """
+    Counts the WebDriver commands and requests calls made by the bot, per calling module
+    (dailySet, searches...), as a cheap proxy of what a run costs.
+    """
+
+    creditedModule: ContextVar[str | None] = ContextVar("creditedModule", default=None)
+    """
+    set by `creditTo`, the module credited with every call instead of looking up the stack
+    """
+
+    def __init__(self):
+        self.counts: Counter[tuple[str, str]] = Counter()
+        self.lock = threading.Lock()
+
+    def instrumentWebdriver(self, driver: WebDriver) -> None:
+        execute = driver.execute
+
+        def countedExecute(driverCommand: str, params: dict | None = None) -> Any:
+            if command := COUNTED_COMMANDS.get(driverCommand):
+                self.count(command)
+            return execute(driverCommand, params)
+
+        driver.execute = countedExecute  # type: ignore[method-assign]
+
+    def instrumentSession(self, session: Session) -> None:
+        request = session.request
+
+        def countedRequest(*args, **kwargs) -> Any:
+            self.count("requests")
+            return request(*args, **kwargs)
+
+        session.request = countedRequest  # type: ignore[method-assign]
+
+    def count(self, command: str) -> None:
+        module = CommandCounter.getCallingModule()
+        with self.lock:
+            self.counts[(module, command)] += 1
+
+    @staticmethod
+    @contextlib.contextmanager
+    def creditTo(module: str) -> Iterator[None]:
+        """Credits the calls made within to the module, ex: an activity run by the planner."""
+        token = CommandCounter.creditedModule.set(module)
+        try:
+            yield
+        finally:
+            CommandCounter.creditedModule.reset(token)
+
+    @staticmethod
+    def getCallingModule() -> str:
+        """Returns the first module of the bot up the stack that isn't a pass-through helper."""
+        if (module := CommandCounter.creditedModule.get()) is not None:
+            return module
+        frame = sys._getframe(2)  # pylint: disable=protected-access
+        while frame is not None:
+            path = Path(frame.f_code.co_filename)
+            if path.parent == SRC_DIR and path.stem not in PASS_THROUGH_MODULES:
+                return path.stem
+            if path.parent == SRC_DIR.parent and path.suffix == ".py":
+                return path.stem
+            frame = frame.f_back
+        return "other"
+
+    @staticmethod
+    def formatCounts(counts: Counter[tuple[str, str]]) -> str:
+        """One line per module, busiest first, ex: `searches: get 0, execute_script 12, ...`."""
+        if not counts:
+            return "no commands"
+        perModule: dict[str, Counter[str]] = defaultdict(Counter)
+        for (module, command), count in counts.items():
+            perModule[module][command] += count
+        return "\n".join(
+            f"{module}: "
+            + ", ".join(
+                f"{command} {commands[command]}" for command in REPORTED_COMMANDS
+            )
+            for module, commands in sorted(
+                perModule.items(), key=lambda item: -sum(item[1].values())
+            )
+        )
+
+    @staticmethod
+    def merge(counters: Iterable["CommandCounter"]) -> Counter[tuple[str, str]]:
+        merged: Counter[tuple[str, str]] = Counter()
+        for counter in counters:
+            merged.update(counter.counts)
+        return merged
@@ -0,0 +1,226 @@
+import logging
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .constants import (
+    DEFAULT_ALLOWED_URLS,
+    DEFAULT_BLOCKED_PATTERNS,
+    DEFAULT_DISMISS_SELECTORS,
+    DEFAULT_PROMOTION_SEARCHES,
+)
+
+# Expected sections of the config files and the types of their keys
+SCHEMA: dict[str, dict[str, type | tuple[type, ...]]] = {
+    "apprise": {
+        "summary": str,
+        "urls": list,
+        "command_counts": bool,
+    },
+    "retries": {
+        "base_delay_in_seconds": (int, float),
+        "max": int,
+        "strategy": str,
+    },
+    "browser": {
+        "selenium_wire": str,
+        "request_storage_max_size": int,
+        "dismiss_selectors": list,
+    },
+    "blocking": {
+        "enabled": bool,
+        "patterns": list,
+        "allowlist": list,
+        "stats": bool,
+    },
+    "searches": {
+        "pacing_min_in_seconds": (int, float),
+        "pacing_max_in_seconds": (int, float),
+        "credit_wait_in_seconds": (int, float),
+    },
+    "promotions": {
+        "searches": dict,
+    },
+    "cache": {
+        "dashboard_max_age_in_seconds": (int, float),
+        "releases_ttl_in_hours": (int, float),
+        "related_terms_ttl_in_hours": (int, float),
+        "related_terms_prefetch": int,
+    },
+}
+
+# Keys only taking one of these values
+CHOICES: dict[tuple[str, str], tuple[str, ...]] = {
+    ("apprise", "summary"): ("ALWAYS", "ON_ERROR", "NEVER"),
+    ("retries", "strategy"): ("EXPONENTIAL", "CONSTANT"),
+    ("browser", "selenium_wire"): ("auto", "always", "never"),
+}
+
+
+class Config:
+    """
+    A config file parsed once and only parsed again when its modification time changes.
+    Use `Config.forFilename` to share the same instance across the program.
+    """
+
+    instances: dict[str, "Config"] = {}
+
+    def __init__(self, filename: str):
+        self.path = Path(__file__).parent.parent / filename
+        self.mtime: float | None = None
+        self._data: dict[str, Any] = {}
+
+    @staticmethod
+    def forFilename(filename: str) -> "Config":
+        if filename not in Config.instances:
+            Config.instances[filename] = Config(filename)
+        return Config.instances[filename]
+
+    @property
+    def data(self) -> dict[str, Any]:
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            if self.mtime != -1:
+                logging.warning(f"{self.path.name} doesn't exist")
+                self.mtime = -1
+                self._data = {}
+            return self._data
+        if mtime != self.mtime:
+            with open(self.path, "r") as file:
+                data = yaml.safe_load(file) or {}
+            self.validate(data)
+            self._data = data
+            self.mtime = mtime
+        return self._data
+
+    def validate(self, data: Any) -> None:
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.path.name} must be a mapping")
+        errors: list[str] = []
+        for sectionName, section in data.items():
+            if sectionName not in SCHEMA:
+                logging.warning(f"{self.path.name}: unknown section '{sectionName}'")
+                continue
+            if not isinstance(section, dict):
+                errors.append(f"'{sectionName}' must be a mapping")
+                continue
+            for key, value in section.items():
+                expectedType = SCHEMA[sectionName].get(key)
+                if expectedType is None:
+                    logging.warning(
+                        f"{self.path.name}: unknown key '{sectionName}.{key}'"
+                    )
+                elif not isinstance(value, expectedType) or (
+                    isinstance(value, bool) and expectedType is not bool
+                ):
+                    errors.append(f"'{sectionName}.{key}' has invalid value {value!r}")
+                elif (
+                    choices := CHOICES.get((sectionName, key))
+                ) is not None and value not in choices:
+                    errors.append(
+                        f"'{sectionName}.{key}' has invalid value {value!r},"
+                        f" expected one of {', '.join(choices)}"
+                    )
+        if errors:
+            raise ValueError(f"Invalid {self.path.name}: {', '.join(errors)}")
+
+    def getValue(self, section: str, key: str, default: Any) -> Any:
+        return self.data.get(section, {}).get(key, default)
+
+    @property
+    def appriseSummary(self) -> str:
+        return self.getValue("apprise", "summary", "ALWAYS")
+
+    @property
+    def appriseUrls(self) -> list[str]:
+        return self.getValue("apprise", "urls", [])
+
+    @property
+    def appriseCommandCounts(self) -> bool:
+        return self.getValue("apprise", "command_counts", False)
+
+    @property
+    def retriesBaseDelay(self) -> float:
+        return float(self.getValue("retries", "base_delay_in_seconds", 14.0625))
+
+    @property
+    def retriesMax(self) -> int:
+        return self.getValue("retries", "max", 8)
+
+    @property
+    def retriesStrategy(self) -> str:
+        return self.getValue("retries", "strategy", "CONSTANT")
+
+    @property
+    def browserSeleniumWire(self) -> str:
+        """auto (only when a proxy is set), always or never."""
+        return self.getValue("browser", "selenium_wire", "auto")
+
+    @property
+    def browserRequestStorageMaxSize(self) -> int:
+        return self.getValue("browser", "request_storage_max_size", 100)
+
+    @property
+    def browserDismissSelectors(self) -> list[str]:
+        return self.getValue("browser", "dismiss_selectors", DEFAULT_DISMISS_SELECTORS)
+
+    @property
+    def blockingEnabled(self) -> bool:
+        return self.getValue("blocking", "enabled", True)
+
+    @property
+    def blockingPatterns(self) -> list[str]:
+        return self.getValue("blocking", "patterns", DEFAULT_BLOCKED_PATTERNS)
+
+    @property
+    def blockingAllowlist(self) -> list[str]:
+        return self.getValue("blocking", "allowlist", DEFAULT_ALLOWED_URLS)
+
+    @property
+    def blockingStats(self) -> bool:
+        return self.getValue("blocking", "stats", False)
+
+    @property
+    def promotionsSearches(self) -> dict[str, str]:
+        """The default More Promotions searches, extended or overridden by the config."""
+        return {
+            **DEFAULT_PROMOTION_SEARCHES,
+            **self.getValue("promotions", "searches", {}),
+        }
+
+    @property
+    def searchesPacing(self) -> tuple[float, float]:
+        """Bounds of the random time a search takes at least, page loads included."""
+        return (
+            float(self.getValue("searches", "pacing_min_in_seconds", 10)),
+            float(self.getValue("searches", "pacing_max_in_seconds", 15)),
+        )
+
+    @property
+    def searchesCreditWait(self) -> float:
+        """How long to wait for Bing to report a search, when selenium-wire captures traffic."""
+        return float(self.getValue("searches", "credit_wait_in_seconds", 2))
+
+    @property
+    def dashboardMaxAge(self) -> float:
+        return float(self.getValue("cache", "dashboard_max_age_in_seconds", 300))
+
+    @property
+    def releasesTtl(self) -> float:
+        """In seconds."""
+        return float(self.getValue("cache", "releases_ttl_in_hours", 24)) * 3600
+
+    @property
+    def relatedTermsTtl(self) -> float:
+        """In seconds."""
+        return float(self.getValue("cache", "related_terms_ttl_in_hours", 168)) * 3600
+
+    @property
+    def relatedTermsPrefetch(self) -> int:
+        return self.getValue("cache", "related_terms_prefetch", 5)
+
+
+CONFIG = Config.forFilename("config.yaml")
+PRIVATE_CONFIG = Config.forFilename("config-private.yaml")
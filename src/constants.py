@@ -1,3 +1,87 @@
-REWARDS_URL = "https://rewards.bing.com/"
-SEARCH_URL = "https://bing.com/"
+import os
+from urllib.parse import urlsplit
+
+STAND_IN_URL = os.environ.get("MS_REWARDS_STAND_IN_URL")
+"""
+when set (ex: http://127.0.0.1:8080), every Microsoft and Google url is rewritten to this local
+stand-in instead, see test/standInServer.py
+"""
+
+
+def rewriteUrl(url: str) -> str:
+    """Points the url at the stand-in if one is set, ex: https://bing.com/ -> {STAND_IN_URL}/bing.com/"""
+    if not STAND_IN_URL:
+        return url
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{STAND_IN_URL.rstrip('/')}/{parts.netloc}{parts.path}{query}"
+
+
+REWARDS_URL = rewriteUrl("https://rewards.bing.com/")
+REWARDS_API_URL = rewriteUrl("https://rewards.bing.com/api/getuserinfo?type=1")
+SEARCH_URL = rewriteUrl("https://bing.com/")
 VERSION = 3
+
+# Default blocking.patterns, fonts and media are blocked on every site, see src/resourceBlocker.py
+DEFAULT_BLOCKED_PATTERNS = [
+    # Fonts and media, pages work fine without them
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.mp4",
+    "*.webm",
+    "*.mp3",
+    # Ads and tracking
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*adnxs.com*",
+    "*scorecardresearch.com*",
+    "*clarity.ms*",
+    "*://bat.bing.com/*",
+]
+# Default blocking.allowlist, URLs that must keep loading, blocking patterns matching any are dropped
+DEFAULT_ALLOWED_URLS = [
+    "https://rewards.bing.com/",
+    "https://rewards.bing.com/api/getuserinfo?type=1",
+    "https://login.live.com/login.srf",
+    "https://www.bing.com/rewardsapp/reportActivity",
+    "https://www.bing.com/rewards/panelflyout/getuserinfo",
+]
+
+# Default promotions.searches, see src/promotionMatcher.py
+# todo These are US-English specific, other locales can be added with promotions.searches in config.yaml
+DEFAULT_PROMOTION_SEARCHES = {
+    "Search the lyrics of a song": "black sabbath supernaut lyrics",
+    "Translate anything": "translate pencil sharpener to spanish",
+    "Let's watch that movie again!": "aliens movie",
+    "Discover open job roles": "walmart open job roles",
+    "Plan a quick getaway": "flights nyc to paris",
+    "You can track your package": "usps tracking",
+    "Find somewhere new to explore": "directions to new york",
+    "Too tired to cook tonight?": "Pizza Hut near me",
+    "Quickly convert your money": "convert 374 usd to yen",
+    "Learn to cook a new recipe": "how cook pierogi",
+    "Find places to stay": "hotels rome italy",
+    "How's the economy?": "sp 500",
+    "Who won?": "braves score",
+    "Gaming time": "vampire survivors video game",
+    "Expand your vocabulary": "definition definition",
+    "What time is it?": "china time",
+}
+
+# Default browser.dismiss_selectors, only the first match of each is clicked, see src/messageDismisser.py
+DEFAULT_DISMISS_SELECTORS = [
+    # Login prompts
+    "#iLandingViewAction",
+    "#iShowSkip",
+    "#iNext",
+    "#iLooksGood",
+    "#idSIButton9",
+    "#acceptButton",
+    # Cookie banners
+    "#bnp_btn_accept",
+    "#cookie-banner button",
+]
@@ -9,6 +9,7 @@ from selenium.webdriver.common.by import By
 from undetected_chromedriver import Chrome
 
 from src.browser import Browser
+from src.tracer import Tracer
 
 
 class Login:
@@ -22,6 +23,7 @@ class Login:
         self.utils = browser.utils
         self.args = args
 
+    @Tracer.traced
     def login(self) -> None:
         if self.utils.isLoggedIn():
             logging.info("[LOGIN] Already logged-in")
@@ -0,0 +1,61 @@
+import contextlib
+import logging
+
+from selenium.common import (
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+# Returns the first element matching each of the selectors when it's visible, each once
+FIND_VISIBLE_SCRIPT = """
+const found = new Set();
+for (const selector of arguments[0]) {
+    let element;
+    try {
+        element = document.querySelector(selector);
+    } catch (e) {
+        continue;
+    }
+    if (element === null) {
+        continue;
+    }
+    const style = getComputedStyle(element);
+    if (
+        element.getClientRects().length > 0
+        && style.visibility !== "hidden"
+        && style.display !== "none"
+    ) {
+        found.add(element);
+    }
+}
+return Array.from(found);
+"""
+
+
+class MessageDismisser:
+    """
+    Dismisses login prompts and cookie banners getting in the way of clicks. All the selectors
+    are checked in one script call, so when nothing is shown it costs a single round-trip.
+    """
+
+    def __init__(self, selectors: list[str]):
+        self.selectors = selectors
+
+    def dismiss(self, driver: WebDriver) -> int:
+        """Clicks the visible messages, returns how many were clicked."""
+        elements: list[WebElement] = driver.execute_script(
+            FIND_VISIBLE_SCRIPT, self.selectors
+        )
+        clicked = 0
+        for element in elements:
+            # Dismissing one message can remove or hide another
+            with contextlib.suppress(
+                ElementNotInteractableException, StaleElementReferenceException
+            ):
+                element.click()
+                clicked += 1
+        if clicked:
+            logging.debug(f"[BROWSER] Dismissed {clicked} messages")
+        return clicked
@@ -0,0 +1,41 @@
+import re
+
+
+class PromotionMatcher:
+    """
+    Finds the search to do for a More Promotions activity, keyed by its offerId or a part of
+    its title. Keys are normalised and titles matched with one precompiled pattern.
+    """
+
+    def __init__(self, searches: dict[str, str]):
+        self.searches = {
+            PromotionMatcher.normalise(key): query for key, query in searches.items()
+        }
+        self.titlePattern: re.Pattern[str] | None = None
+        if self.searches:
+            # Longest first, so a key containing another one wins
+            self.titlePattern = re.compile(
+                "|".join(
+                    re.escape(key)
+                    for key in sorted(self.searches, key=len, reverse=True)
+                )
+            )
+
+    @staticmethod
+    def normalise(text: str) -> str:
+        text = text.replace("\u200b", "").replace("\xa0", " ").replace("\u2019", "'")
+        return " ".join(text.split()).casefold()
+
+    def match(self, promotion: dict) -> str | None:
+        """Returns the query to search for the promotion, None if it isn't a known one."""
+        if query := self.searches.get(
+            PromotionMatcher.normalise(promotion.get("offerId", ""))
+        ):
+            return query
+        if self.titlePattern and (
+            match := self.titlePattern.search(
+                PromotionMatcher.normalise(promotion.get("title", ""))
+            )
+        ):
+            return self.searches[match.group()]
+        return None
@@ -1,12 +1,9 @@
-import logging
 import random
 import time
-import urllib.parse
 
 from selenium.webdriver.common.by import By
 
 from src.browser import Browser
-from .constants import REWARDS_URL
 
 
 class PunchCards:
@@ -52,53 +49,10 @@ class PunchCards:
                     time.sleep(random.randint(100, 700) / 100)
                     self.browser.utils.closeCurrentTab()
 
-    def completePunchCards(self):
-        # Function to complete all punch cards
-        logging.info("[PUNCH CARDS] " + "Trying to complete the Punch Cards...")
-        self.completePromotionalItems()
-        punchCards = self.browser.utils.getDashboardData()["punchCards"]
-        self.browser.utils.goToRewards()
-        for punchCard in punchCards:
-            try:
-                if (
-                    punchCard["parentPromotion"]
-                    and punchCard["childPromotions"]
-                    and not punchCard["parentPromotion"]["complete"]
-                    and punchCard["parentPromotion"]["pointProgressMax"] != 0
-                ):
-                    # Complete each punch card
-                    self.completePunchCard(
-                        punchCard["parentPromotion"]["attributes"]["destination"],
-                        punchCard["childPromotions"],
-                    )
-            except Exception:  # pylint: disable=broad-except
-                logging.error("[PUNCH CARDS] Error Punch Cards", exc_info=True)
-                self.browser.utils.resetTabs()
-                continue
-        logging.info("[PUNCH CARDS] Exiting")
-
-    def completePromotionalItems(self):
-        # Function to complete promotional items
-        try:
-            item = self.browser.utils.getDashboardData()["promotionalItem"]
-            self.browser.utils.goToRewards()
-            destUrl = urllib.parse.urlparse(item["destinationUrl"])
-            baseUrl = urllib.parse.urlparse(REWARDS_URL)
-            if (
-                (item["pointProgressMax"] in [100, 200, 500])
-                and not item["complete"]
-                and (
-                    (
-                        destUrl.hostname == baseUrl.hostname
-                        and destUrl.path == baseUrl.path
-                    )
-                    or destUrl.hostname == "www.bing.com"
-                )
-            ):
-                # Click on promotional item and visit new tab
-                self.webdriver.find_element(
-                    By.XPATH, '//*[@id="promo-item"]/section/div/div/div/span'
-                ).click()
-                self.browser.utils.visitNewTab(8)
-        except Exception:
-            logging.debug("", exc_info=True)
+    def completePromotionalItem(self) -> None:
+        # Function to complete the promotional item, from the rewards page
+        self.webdriver.find_element(
+            By.XPATH, '//*[@id="promo-item"]/section/div/div/div/span'
+        ).click()
+        self.browser.utils.visitNewTab(8)
+        self.browser.utils.invalidateDashboardData()
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from typing import Any
+
+from selenium.webdriver.common.by import By
+from src.browser import Browser
+from src.utils import Utils
+
+# Same as Utils.getAnswerCodes, code points like Python's ord rather than UTF-16 code units
+ANSWER_CODES_SCRIPT = """
+function getAnswerCodes(key, strings) {
+    const offset = parseInt(key.slice(-2), 16);
+    return strings.map((string) => {
+        let sum = 0;
+        for (const char of string) {
+            sum += char.codePointAt(0);
+        }
+        return String(sum + offset);
+    });
+}
+"""
+# Everything needed to answer the current question, read in a single round-trip
+QUIZ_STATE_SCRIPT = (
+    ANSWER_CODES_SCRIPT
+    + """
+const info = _w.rewardsQuizRenderInfo;
+const options = [];
+for (let i = 0; i < info.numberOfOptions; i++) {
+    const option = document.getElementById("rqAnswerOption" + i);
+    if (option === null) {
+        continue;
+    }
+    options.push({
+        id: option.id,
+        title: option.getAttribute("data-option"),
+        isCorrect: (option.getAttribute("iscorrectoption") || "").toLowerCase() === "true",
+    });
+}
+const encodeKey = typeof _G === "undefined" ? null : _G.IG;
+if (encodeKey) {
+    const answerCodes = getAnswerCodes(encodeKey, options.map((option) => option.title || ""));
+    options.forEach((option, i) => option.answerCode = answerCodes[i]);
+}
+return {
+    currentQuestionNumber: info.currentQuestionNumber,
+    maxQuestions: info.maxQuestions,
+    numberOfOptions: info.numberOfOptions,
+    correctAnswer: info.correctAnswer,
+    encodeKey: encodeKey,
+    options: options,
+};
+"""
+)
+
+
+@dataclass
+class QuizOption:
+    id: str
+    title: str | None
+    isCorrect: bool
+    answerCode: str | None = None
+    """
+    This or That code of the option's title, computed in-page
+    """
+
+
+@dataclass
+class QuizState:
+    currentQuestionNumber: int
+    maxQuestions: int
+    numberOfOptions: int
+    correctAnswer: str | None
+    encodeKey: str | None
+    options: list[QuizOption]
+
+    @staticmethod
+    def fromScript(result: dict[str, Any]) -> "QuizState":
+        return QuizState(
+            currentQuestionNumber=result["currentQuestionNumber"],
+            maxQuestions=result["maxQuestions"],
+            numberOfOptions=result["numberOfOptions"],
+            correctAnswer=result.get("correctAnswer"),
+            encodeKey=result.get("encodeKey"),
+            options=[QuizOption(**option) for option in result["options"]],
+        )
+
+    def getTargets(self) -> list[str]:
+        """Returns the ids of the options to click for the current quiz question."""
+        if self.numberOfOptions == 8:
+            # Several correct answers, each flagged on its option
+            return [option.id for option in self.options if option.isCorrect]
+        if self.numberOfOptions in [2, 3, 4]:
+            return [
+                option.id
+                for option in self.options
+                if option.title == self.correctAnswer
+            ][:1]
+        return []
+
+    def getThisOrThatTarget(self) -> str | None:
+        """Returns the id of the option whose answer code is the correct answer."""
+        answerCodes = [option.answerCode for option in self.options]
+        if None in answerCodes:
+            assert self.encodeKey is not None
+            answerCodes = Utils.getAnswerCodes(
+                self.encodeKey, [option.title or "" for option in self.options]
+            )
+        for option, answerCode in zip(self.options, answerCodes):
+            if answerCode == self.correctAnswer:
+                return option.id
+        return None
+
+
+class QuizEngine:
+    """
+    Answers quizzes by reading each question's state with one injected script, instead of a
+    WebDriver round-trip per option and attribute.
+    """
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.webdriver = browser.webdriver
+
+    def readState(self) -> QuizState:
+        return QuizState.fromScript(self.webdriver.execute_script(QUIZ_STATE_SCRIPT))
+
+    def clickOption(self, optionId: str) -> None:
+        self.browser.utils.click(self.webdriver.find_element(By.ID, optionId))
@@ -6,13 +6,17 @@ import time
 from requests_oauthlib import OAuth2Session
 
 from src.browser import Browser
+from src.tracer import Tracer
 from .activities import Activities
+from .constants import rewriteUrl
 from .utils import Utils
 
 client_id = '0000000040170455'
-authorization_base_url = 'https://login.live.com/oauth20_authorize.srf'
-token_url = 'https://login.microsoftonline.com/consumers/oauth2/v2.0/token'
+authorization_base_url = rewriteUrl('https://login.live.com/oauth20_authorize.srf')
+token_url = rewriteUrl('https://login.microsoftonline.com/consumers/oauth2/v2.0/token')
 redirect_uri = ' https://login.live.com/oauth20_desktop.srf'
+redirect_response_prefix = rewriteUrl("https://login.live.com/oauth20_desktop.srf?code=")
+activities_url = rewriteUrl("https://prod.rewardsplatform.microsoft.com/dapi/me/activities")
 scope = [ "service::prod.rewardsplatform.microsoft.com::MBI_SSL"]
 
 class ReadToEarn:
@@ -21,6 +25,7 @@ class ReadToEarn:
         self.webdriver = browser.webdriver
         self.activities = Activities(browser)
     
+    @Tracer.traced
     def completeReadToEarn(self):
         
         logging.info("[READ TO EARN] " + "Trying to complete Read to Earn...")
@@ -40,13 +45,14 @@ class ReadToEarn:
         # This works, since you already logged into Bing, so no user interaction needed
 
         mobileApp = Utils.makeRequestsSession(OAuth2Session(client_id, scope=scope, redirect_uri=redirect_uri))
+        self.browser.commandCounter.instrumentSession(mobileApp)
         authorization_url, state = mobileApp.authorization_url(authorization_base_url, access_type="offline_access", login_hint=accountName)
         
         # Get Referer URL from webdriver
         self.webdriver.get(authorization_url)
         while True:
             logging.info("[READ TO EARN] Waiting for Login")
-            if self.webdriver.current_url[:48] == "https://login.live.com/oauth20_desktop.srf?code=":
+            if self.webdriver.current_url.startswith(redirect_response_prefix):
                 redirect_response = self.webdriver.current_url
                 break
             time.sleep(1)
@@ -67,7 +73,7 @@ class ReadToEarn:
         }
         json_data['id'] = secrets.token_hex(64)
         logging.info("[READ TO EARN] Daily App Check In")
-        r = mobileApp.post("https://prod.rewardsplatform.microsoft.com/dapi/me/activities",json=json_data)
+        r = mobileApp.post(activities_url,json=json_data)
         balance = r.json().get("response").get("balance")
         time.sleep(random.randint(10, 20))
 
@@ -86,7 +92,7 @@ class ReadToEarn:
         for i in range(10):
             # Replace ID with a random value so get credit for a new article
             json_data['id'] = secrets.token_hex(64)
-            r = mobileApp.post("https://prod.rewardsplatform.microsoft.com/dapi/me/activities",json=json_data)
+            r = mobileApp.post(activities_url,json=json_data)
             newbalance = r.json().get("response").get("balance")
             if newbalance == balance:
                 logging.info("[READ TO EARN] Read All Available Articles !")
@@ -96,4 +102,5 @@ class ReadToEarn:
                 balance = newbalance
                 time.sleep(random.randint(10, 20))
         
+        self.browser.utils.invalidateDashboardData()
         logging.info("[READ TO EARN] Completed the Read to Earn successfully !") 
@@ -0,0 +1,104 @@
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+from src.constants import rewriteUrl
+from src.utils import Utils
+
+
+class RelatedTerms:
+    """
+    Bing suggestions for search terms, cached on disk with an expiry and fetched ahead of time
+    by a background worker so searching never waits on them.
+    """
+
+    def __init__(self, path: Path, userAgent: str, ttl: float):
+        self.userAgent = userAgent
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS related_terms ("
+                "term TEXT PRIMARY KEY, related TEXT NOT NULL, fetchedAt REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "DELETE FROM related_terms WHERE fetchedAt <= ?", (time.time() - ttl,)
+            )
+        # The worker gets its own session, the browser's one stays on the main thread
+        self.session = Utils.makeRequestsSession()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.pending: dict[str, Future[list[str]]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        # Terms fetched but not searched this run are kept for the next ones
+        for term, future in list(self.pending.items()):
+            if future.done() and not future.cancelled():
+                self.collect(term, future)
+        self.session.close()
+        self.connection.close()
+
+    def prefetch(self, terms: Iterable[str]) -> None:
+        """Starts fetching the terms that aren't cached or already being fetched."""
+        for term in terms:
+            if term in self.pending or self.getCached(term) is not None:
+                continue
+            self.pending[term] = self.executor.submit(self.fetch, term)
+
+    def get(self, term: str) -> list[str] | None:
+        """
+        Returns the related terms if they're cached or already fetched, without blocking.
+        Returns None while they're still being fetched.
+        """
+        if (cached := self.getCached(term)) is not None:
+            return cached
+        future = self.pending.get(term)
+        if future is None:
+            self.prefetch([term])
+            return None
+        if not future.done():
+            return None
+        return self.collect(term, future)
+
+    def collect(self, term: str, future: Future[list[str]]) -> list[str]:
+        """Caches the result of a finished fetch, falls back to the term itself if it failed."""
+        del self.pending[term]
+        try:
+            related = future.result()
+        except Exception:  # pylint: disable=broad-except
+            logging.debug(f"Couldn't get related terms of {term}", exc_info=True)
+            return [term]
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO related_terms VALUES (?, ?, ?)",
+                (term, json.dumps(related), time.time()),
+            )
+        return related
+
+    def getCached(self, term: str) -> list[str] | None:
+        row = self.connection.execute(
+            "SELECT related FROM related_terms WHERE term = ? AND fetchedAt > ?",
+            (term, time.time() - self.ttl),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def fetch(self, term: str) -> list[str]:
+        # Function to retrieve related terms from Bing API
+        relatedTerms: list[str] = self.session.get(
+            rewriteUrl(f"https://api.bing.com/osjson.aspx?query={term}"),
+            headers={"User-agent": self.userAgent},
+            timeout=10,
+        ).json()[1]
+        if not relatedTerms:
+            return [term]
+        return relatedTerms
@@ -0,0 +1,91 @@
+import json
+import logging
+from collections import Counter
+from fnmatch import fnmatchcase
+
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+# Typical transfer size of the resources blocked, by CDP resource type, to estimate what was saved
+ESTIMATED_SIZES = {
+    "Font": 40 * 1024,
+    "Media": 500 * 1024,
+    "Script": 30 * 1024,
+    "Image": 20 * 1024,
+}
+ESTIMATED_OTHER_SIZE = 5 * 1024
+
+
+class ResourceBlocker:
+    """
+    Blocks resources the bot doesn't need at the network layer with CDP, and when `collectsStats`
+    is set, tallies what was blocked from Chrome's performance log.
+
+    Network.setBlockedURLs can't make exceptions, so the allowlist is made of URLs that must
+    keep loading and blocking patterns matching any of them are dropped altogether.
+    """
+
+    def __init__(
+        self,
+        blockedPatterns: list[str],
+        allowedUrls: list[str],
+        collectsStats: bool = False,
+    ):
+        self.patterns: list[str] = []
+        for pattern in blockedPatterns:
+            if allowed := next(
+                (url for url in allowedUrls if fnmatchcase(url, pattern)), None
+            ):
+                logging.warning(
+                    f"[BROWSER] Not blocking {pattern}, it would block allowed {allowed}"
+                )
+                continue
+            self.patterns.append(pattern)
+        self.collectsStats = collectsStats
+        """
+        needs Chrome's performance log, which costs a buffer of network events in the driver
+        """
+        self.blockedByPattern: Counter[str] = Counter()
+        self.bytesSaved = 0
+        """
+        estimated from the type of the blocked resources, see ESTIMATED_SIZES
+        """
+        self.bytesDownloaded = 0
+        self.pendingUrls: dict[str, str] = {}
+
+    def apply(self, driver: WebDriver) -> None:
+        """Blocks the patterns in the current tab."""
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+
+    def collectStats(self, driver: WebDriver) -> None:
+        """Reads and empties the performance log, needs the goog:loggingPrefs capability."""
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self.pendingUrls[params["requestId"]] = params["request"]["url"]
+            elif method == "Network.loadingFinished":
+                self.pendingUrls.pop(params["requestId"], None)
+                self.bytesDownloaded += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed":
+                url = self.pendingUrls.pop(params["requestId"], "")
+                if params.get("blockedReason") == "inspector":
+                    pattern = next(
+                        (p for p in self.patterns if fnmatchcase(url, p)), "other"
+                    )
+                    self.blockedByPattern[pattern] += 1
+                    self.bytesSaved += ESTIMATED_SIZES.get(
+                        params.get("type", ""), ESTIMATED_OTHER_SIZE
+                    )
+
+    def getSummary(self) -> str:
+        blocked = sum(self.blockedByPattern.values())
+        topPatterns = ", ".join(
+            f"{pattern}: {count}"
+            for pattern, count in self.blockedByPattern.most_common(5)
+        )
+        return (
+            f"blocked {blocked} requests ({topPatterns or 'none'}),"
+            f" saved about {self.bytesSaved / 1024 / 1024:.1f} MB,"
+            f" downloaded {self.bytesDownloaded / 1024 / 1024:.1f} MB"
+        )
@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from .utils import Utils
+
+
+class RunJournal:
+    """
+    Records what an account's run of the day got done, in logs/journal, so a run resumed after
+    a failure (-r/--resume) can skip the phases and activities already completed.
+
+    Every run writes its journal, resuming or not, as it's the failed run that has to leave one
+    behind. Saved after every change, a crash loses at most the step that was in progress, and
+    journals of previous days are deleted as they can't be resumed anymore.
+    """
+
+    def __init__(self, path: Path, data: dict[str, Any] | None = None):
+        self.path = path
+        self.data: dict[str, Any] = {
+            "startingPoints": None,
+            "phases": [],
+            "tasks": [],
+            "finished": False,
+            **(data or {}),
+        }
+
+    @staticmethod
+    def forAccount(
+        username: str, resume: bool, day: date | None = None
+    ) -> "RunJournal":
+        """Returns the account's journal of the day, a new one unless resuming."""
+        day = day or date.today()
+        name = re.sub(r"[^\w.@-]", "_", username)
+        journalDir = Utils.getProjectRoot() / "logs" / "journal"
+        path = journalDir / f"{day.isoformat()}_{name}.json"
+        for oldPath in journalDir.glob("*.json"):
+            if not oldPath.name.startswith(day.isoformat()):
+                oldPath.unlink(missing_ok=True)
+        if resume and path.exists():
+            try:
+                journal = RunJournal(path, json.loads(path.read_text(encoding="utf-8")))
+                donePhases = ", ".join(journal.data["phases"]) or "nothing"
+                logging.info(f"[RESUME] Resuming {username}, done: {donePhases}")
+                return journal
+            except ValueError:
+                logging.warning(
+                    f"[RESUME] Ignoring unreadable journal {path}", exc_info=True
+                )
+        return RunJournal(path)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporaryPath = self.path.with_suffix(".tmp")
+        temporaryPath.write_text(json.dumps(self.data, indent=4), encoding="utf-8")
+        os.replace(temporaryPath, self.path)
+
+    @property
+    def startingPoints(self) -> int | None:
+        return self.data["startingPoints"]
+
+    @startingPoints.setter
+    def startingPoints(self, points: int) -> None:
+        self.data["startingPoints"] = points
+        self.save()
+
+    @property
+    def finished(self) -> bool:
+        return self.data["finished"]
+
+    def markFinished(self) -> None:
+        self.data["finished"] = True
+        self.save()
+
+    def isDone(self, *phases: str) -> bool:
+        return all(phase in self.data["phases"] for phase in phases)
+
+    def markDone(self, phase: str) -> None:
+        if phase not in self.data["phases"]:
+            self.data["phases"].append(phase)
+            self.save()
+
+    def isTaskDone(self, taskId: str) -> bool:
+        return taskId in self.data["tasks"]
+
+    def markTaskDone(self, taskId: str) -> None:
+        if taskId not in self.data["tasks"]:
+            self.data["tasks"].append(taskId)
+            self.save()
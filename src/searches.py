@@ -1,16 +1,18 @@
 import contextlib
-import dbm.dumb
 import json
 import logging
 import random
-import shelve
+import re
 import time
-from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from enum import Enum, auto
+from functools import partial
 from itertools import cycle
 from typing import Final
 
 import requests
+from requests import Session
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
@@ -18,6 +20,11 @@ from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.wait import WebDriverWait
 
 from src.browser import Browser
+from src.config import CONFIG
+from src.constants import rewriteUrl
+from src.relatedTerms import RelatedTerms
+from src.tracer import Tracer
+from src.trendsQueue import TrendsQueue
 from src.utils import Utils
 
 
@@ -36,77 +43,153 @@ class RetriesStrategy(Enum):
     """
 
 
+class SearchCreditWatcher:
+    """
+    Tells whether a search got credited with a single points read per attempt.
+
+    The balance read after an attempt is kept as the baseline of the next one, and when the
+    driver captures traffic (selenium-wire), the read waits for Bing to report the search
+    activity instead of racing it.
+    """
+
+    reportActivityPattern: Final[str] = r"/rewardsapp/reportActivity"
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.lastKnownPoints: int | None = None
+
+    @property
+    def capturesTraffic(self) -> bool:
+        return hasattr(self.browser.webdriver, "wait_for_request")
+
+    def beforeAttempt(self) -> None:
+        if self.lastKnownPoints is None:
+            self.lastKnownPoints = self.browser.utils.getAccountPoints()
+        if self.capturesTraffic:
+            del self.browser.webdriver.requests
+
+    def hasReportedActivity(self) -> bool:
+        return any(
+            re.search(self.reportActivityPattern, request.url)
+            for request in self.browser.webdriver.requests
+        )
+
+    def wasCredited(self, timeToWait: float | None = None) -> bool:
+        if self.capturesTraffic and not self.hasReportedActivity():
+            with contextlib.suppress(TimeoutException):
+                self.browser.webdriver.wait_for_request(
+                    self.reportActivityPattern,
+                    timeout=CONFIG.searchesCreditWait if timeToWait is None else timeToWait,
+                )
+        points = self.browser.utils.getAccountPoints()
+        credited = self.lastKnownPoints is not None and points > self.lastKnownPoints
+        self.lastKnownPoints = points
+        return credited
+
+
 class Searches:
-    config = Utils.loadConfig()
-    maxRetries: Final[int] = config.get("retries", {}).get("max", 8)
+    maxRetries: Final[int] = CONFIG.retriesMax
     """
     the max amount of retries to attempt
     """
-    baseDelay: Final[float] = config.get("retries", {}).get(
-        "base_delay_in_seconds", 14.0625
-    )
+    baseDelay: Final[float] = CONFIG.retriesBaseDelay
     """
     how many seconds to delay
     """
     # retriesStrategy = Final[  # todo Figure why doesn't work with equality below
-    retriesStrategy = RetriesStrategy[
-        config.get("retries", {}).get("strategy", RetriesStrategy.CONSTANT.name)
-    ]
+    retriesStrategy = RetriesStrategy[CONFIG.retriesStrategy]
+    googleTrendsDaysPerBatch: Final[int] = 4
+    """
+    how many past days of Google Trends are fetched concurrently
+    """
+    googleTrendsMaxBatches: Final[int] = 4
+    """
+    how many batches of past days are fetched at most to fill the queue
+    """
 
     def __init__(self, browser: Browser):
         self.browser = browser
         self.webdriver = browser.webdriver
 
-        dumbDbm = dbm.dumb.open((Utils.getProjectRoot() / "google_trends").__str__())
-        self.googleTrendsShelf: shelve.Shelf = shelve.Shelf(dumbDbm)
+        self.googleTrendsQueue = TrendsQueue(
+            Utils.getProjectRoot() / "google_trends.sqlite"
+        )
+        self.relatedTerms = RelatedTerms(
+            Utils.getCacheDir() / "related_terms.sqlite",
+            browser.userAgent,
+            CONFIG.relatedTermsTtl,
+        )
+        browser.commandCounter.instrumentSession(self.relatedTerms.session)
+        self.creditWatcher = SearchCreditWatcher(browser)
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.googleTrendsShelf.__exit__(None, None, None)
-
-    def getGoogleTrends(self, wordsCount: int) -> list[str]:
-        # Function to retrieve Google Trends search terms
-        searchTerms: list[str] = []
-        i = 0
-        session = Utils.makeRequestsSession()
-        while len(searchTerms) < wordsCount:
-            i += 1
-            # Fetching daily trends from Google Trends API
-            r = session.get(
+        self.googleTrendsQueue.close()
+        self.relatedTerms.close()
+
+    def loadGoogleTrends(self, wordsCount: int) -> None:
+        # Fills the queue with Google Trends search terms, a few past days at a time
+        self.pruneGoogleTrendsCache()
+        with Utils.makeRequestsSession() as session, ThreadPoolExecutor(
+            max_workers=self.googleTrendsDaysPerBatch
+        ) as executor:
+            self.browser.commandCounter.instrumentSession(session)
+            for batch in range(self.googleTrendsMaxBatches):
+                if len(self.googleTrendsQueue) >= wordsCount:
+                    return
+                # Recent days may only have terms already queued, older ones are tried next
+                days = [
+                    date.today()
+                    - timedelta(days=batch * self.googleTrendsDaysPerBatch + i)
+                    for i in range(1, self.googleTrendsDaysPerBatch + 1)
+                ]
+                for searchTerms in executor.map(
+                    partial(self.getGoogleTrendsOfDay, session), days
+                ):
+                    random.shuffle(searchTerms)
+                    self.googleTrendsQueue.extend(searchTerms)
+        if len(self.googleTrendsQueue) < wordsCount:
+            logging.warning("[BING] Not enough new Google Trends search terms found")
+
+    def pruneGoogleTrendsCache(self) -> None:
+        # Only the first batch of days is fetched again on the next runs, older days are dropped
+        oldestDay = date.today() - timedelta(days=self.googleTrendsDaysPerBatch)
+        for cacheFile in Utils.getCacheDir().glob("google_trends_*.json"):
+            with contextlib.suppress(ValueError):
+                day = datetime.strptime(cacheFile.stem.rsplit("_", 1)[1], "%Y%m%d").date()
+                if day < oldestDay:
+                    cacheFile.unlink(missing_ok=True)
+
+    def getGoogleTrendsOfDay(self, session: Session, day: date) -> list[str]:
+        # A past day's trends never change, so they're cached once fetched
+        cacheName = (
+            f"google_trends_{self.browser.localeGeo}_{self.browser.localeLang}"
+            f"_{day.strftime('%Y%m%d')}"
+        )
+        if (searchTerms := Utils.loadCache(cacheName)) is not None:
+            return searchTerms
+        # Fetching daily trends from Google Trends API
+        r = session.get(
+            rewriteUrl(
                 f"https://trends.google.com/trends/api/dailytrends?hl={self.browser.localeLang}"
-                f'&ed={(date.today() - timedelta(days=i)).strftime("%Y%m%d")}&geo={self.browser.localeGeo}&ns=15'
+                f'&ed={day.strftime("%Y%m%d")}&geo={self.browser.localeGeo}&ns=15'
             )
-            assert (
-                r.status_code == requests.codes.ok
-            )  # todo Add guidance if assertion fails
-            trends = json.loads(r.text[6:])
-            for topic in trends["default"]["trendingSearchesDays"][0][
-                "trendingSearches"
-            ]:
-                searchTerms.append(topic["title"]["query"].lower())
-                searchTerms.extend(
-                    relatedTopic["query"].lower()
-                    for relatedTopic in topic["relatedQueries"]
-                )
-            searchTerms = list(set(searchTerms))
-        del searchTerms[wordsCount : (len(searchTerms) + 1)]
-        return searchTerms
-
-    def getRelatedTerms(self, term: str) -> list[str]:
-        # Function to retrieve related terms from Bing API
-        relatedTerms: list[str] = (
-            Utils.makeRequestsSession()
-            .get(
-                f"https://api.bing.com/osjson.aspx?query={term}",
-                headers={"User-agent": self.browser.userAgent},
+        )
+        assert (
+            r.status_code == requests.codes.ok
+        )  # todo Add guidance if assertion fails
+        trends = json.loads(r.text[6:])
+        searchTerms = []
+        for topic in trends["default"]["trendingSearchesDays"][0]["trendingSearches"]:
+            searchTerms.append(topic["title"]["query"].lower())
+            searchTerms.extend(
+                relatedTopic["query"].lower() for relatedTopic in topic["relatedQueries"]
             )
-            .json()[1]
-        )  # todo Wrap if failed, or assert response?
-        if not relatedTerms:
-            return [term]
-        return relatedTerms
+        searchTerms = list(dict.fromkeys(searchTerms))
+        Utils.saveCache(cacheName, searchTerms)
+        return searchTerms
 
     def bingSearches(self) -> None:
         # Function to perform Bing searches
@@ -116,25 +199,32 @@ class Searches:
 
         self.browser.utils.goToSearch()
 
-        while (remainingSearches := self.browser.getRemainingSearches()) > 0:
-            logging.info(f"[BING] Remaining searches={remainingSearches}")
+        while True:
             desktopAndMobileRemaining = self.browser.getRemainingSearches(
                 desktopAndMobile=True
             )
-            if desktopAndMobileRemaining.getTotal() > len(self.googleTrendsShelf):
-                # self.googleTrendsShelf.clear()  # Maybe needed?
+            remainingSearches = (
+                desktopAndMobileRemaining.mobile
+                if self.browser.mobile
+                else desktopAndMobileRemaining.desktop
+            )
+            if remainingSearches <= 0:
+                break
+            logging.info(f"[BING] Remaining searches={remainingSearches}")
+            if desktopAndMobileRemaining.getTotal() > len(self.googleTrendsQueue):
                 logging.debug(
-                    f"google_trends before load = {list(self.googleTrendsShelf.items())}"
+                    f"google_trends before load = {list(self.googleTrendsQueue)}"
                 )
-                trends = self.getGoogleTrends(desktopAndMobileRemaining.getTotal())
-                random.shuffle(trends)
-                for trend in trends:
-                    self.googleTrendsShelf[trend] = None
+                self.loadGoogleTrends(desktopAndMobileRemaining.getTotal())
                 logging.debug(
-                    f"google_trends after load = {list(self.googleTrendsShelf.items())}"
+                    f"google_trends after load = {list(self.googleTrendsQueue)}"
                 )
+            searchStart = time.monotonic()
             self.bingSearch()
-            time.sleep(random.randint(10, 15))
+            self.browser.collectResourceStats()
+            # Pacing is kept apart from waiting for the page, the load time counts towards it
+            pacing = random.uniform(*CONFIG.searchesPacing)
+            time.sleep(max(0.0, pacing - (time.monotonic() - searchStart)))
 
         logging.info(
             f"[BING] Finished {self.browser.browserType.capitalize()} Edge Bing searches !"
@@ -142,12 +232,14 @@ class Searches:
 
     def bingSearch(self) -> None:
         # Function to perform a single Bing search
-        pointsBefore = self.browser.utils.getAccountPoints()
-
-        rootTerm = list(self.googleTrendsShelf.keys())[0]
-        terms = self.getRelatedTerms(rootTerm)
+        rootTerm = self.googleTrendsQueue.peek()
+        self.relatedTerms.prefetch(
+            self.googleTrendsQueue.head(CONFIG.relatedTermsPrefetch + 1)
+        )
+        # Start with the root term if its related terms aren't there yet, retries pick them up
+        terms = self.relatedTerms.get(rootTerm)
         logging.debug(f"terms={terms}")
-        termsCycle: cycle[str] = cycle(terms)
+        termsCycle: cycle[str] = cycle(terms or [rootTerm])
         baseDelay = Searches.baseDelay
         logging.debug(f"rootTerm={rootTerm}")
 
@@ -165,35 +257,40 @@ class Searches:
                     f" seconds..."
                 )
                 time.sleep(sleepTime)
+                if terms is None and (terms := self.relatedTerms.get(rootTerm)):
+                    logging.debug(f"terms={terms}")
+                    termsCycle = cycle(terms)
 
-            searchbar: WebElement
-            for _ in range(1000):
-                searchbar = self.browser.utils.waitUntilClickable(
-                    By.ID, "sb_form_q", timeToWait=40
-                )
-                searchbar.clear()
-                term = next(termsCycle)
-                logging.debug(f"term={term}")
-                time.sleep(1)
-                searchbar.send_keys(term)
-                time.sleep(1)
-                with contextlib.suppress(TimeoutException):
-                    WebDriverWait(self.webdriver, 20).until(
-                        expected_conditions.text_to_be_present_in_element_value(
-                            (By.ID, "sb_form_q"), term
-                        )
+            with Tracer.span("Searches.bingSearch attempt", attempt=i):
+                self.creditWatcher.beforeAttempt()
+                searchbar: WebElement
+                for _ in range(1000):
+                    searchbar = self.browser.utils.waitUntilClickable(
+                        By.ID, "sb_form_q", timeToWait=40
                     )
-                    break
-                logging.debug("error send_keys")
-            else:
-                # todo Still happens occasionally, gotta be a fix
-                raise TimeoutException
-            searchbar.submit()
-
-            pointsAfter = self.browser.utils.getAccountPoints()
-            if pointsBefore < pointsAfter:
-                del self.googleTrendsShelf[rootTerm]
-                return
+                    searchbar.clear()
+                    term = next(termsCycle)
+                    logging.debug(f"term={term}")
+                    searchbar.send_keys(term)
+                    with contextlib.suppress(TimeoutException):
+                        WebDriverWait(self.webdriver, 20).until(
+                            expected_conditions.text_to_be_present_in_element_value(
+                                (By.ID, "sb_form_q"), term
+                            )
+                        )
+                        break
+                    logging.debug("error send_keys")
+                else:
+                    # todo Still happens occasionally, gotta be a fix
+                    raise TimeoutException
+                searchbar.submit()
+                with contextlib.suppress(TimeoutException):
+                    self.browser.utils.waitUntilPageLoaded(searchbar)
+
+                if self.creditWatcher.wasCredited():
+                    self.googleTrendsQueue.remove(rootTerm)
+                    self.browser.utils.invalidateDashboardData()
+                    return
 
             # todo
             # if i == (maxRetries / 2):
@@ -202,5 +299,4 @@ class Searches:
         logging.error("[BING] Reached max search attempt retries")
 
         logging.debug("Moving passedInTerm to end of list")
-        del self.googleTrendsShelf[rootTerm]
-        self.googleTrendsShelf[rootTerm] = None
+        self.googleTrendsQueue.rotate(rootTerm)
@@ -0,0 +1,63 @@
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.wait import WebDriverWait
+
+
+class TabManager:
+    """
+    Keeps track of the bot's main tab and the tabs activities open from it, waiting on the
+    window handles to actually change instead of sleeping after each switch.
+    """
+
+    pollFrequency = 0.1
+
+    def __init__(self, webdriver: WebDriver):
+        self.webdriver = webdriver
+        self.mainHandle: str | None = None
+        """
+        the tab everything is opened from, the current one when first needed
+        """
+        self.openedHandles: list[str] = []
+
+    def getMainHandle(self) -> str:
+        if self.mainHandle is None:
+            self.mainHandle = self.webdriver.current_window_handle
+        return self.mainHandle
+
+    def setMainTab(self, handle: str) -> None:
+        self.mainHandle = handle
+        self.openedHandles.clear()
+
+    def switchToNewTab(self, timeToWait: float = 0) -> str:
+        """Switches to the tab opened last, waiting up to timeToWait for it to open."""
+        knownHandles = [self.getMainHandle(), *self.openedHandles]
+        WebDriverWait(self.webdriver, timeToWait, self.pollFrequency).until(
+            expected_conditions.new_window_is_opened(knownHandles)
+        )
+        handle = next(
+            handle
+            for handle in reversed(self.webdriver.window_handles)
+            if handle not in knownHandles
+        )
+        self.openedHandles.append(handle)
+        self.webdriver.switch_to.window(handle)
+        return handle
+
+    def closeCurrentTab(self) -> None:
+        """Closes the current tab and goes back to the main one."""
+        handle = self.webdriver.current_window_handle
+        # Closing a window only returns once it's closed, no need to wait for it
+        self.webdriver.close()
+        if handle in self.openedHandles:
+            self.openedHandles.remove(handle)
+        self.webdriver.switch_to.window(self.getMainHandle())
+
+    def closeOtherTabs(self) -> None:
+        """Closes every tab but the main one and switches to it."""
+        mainHandle = self.getMainHandle()
+        for handle in self.webdriver.window_handles:
+            if handle != mainHandle:
+                self.webdriver.switch_to.window(handle)
+                self.webdriver.close()
+        self.openedHandles.clear()
+        self.webdriver.switch_to.window(mainHandle)
@@ -0,0 +1,101 @@
+import contextlib
+import functools
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+
+class Tracer:
+    """
+    Records how long each phase of a run takes.
+
+    Spans are kept in memory for the end of run summary, and appended to a JSONL file when one
+    is set with `setTraceFile`, which holds a single run as the previous ones are rotated.
+    """
+
+    spans: list[dict[str, Any]] = []
+    context: dict[str, Any] = {}
+    """
+    attributes added to every span, like the current account
+    """
+    traceFile: Path | None = None
+    lock = threading.Lock()
+
+    @staticmethod
+    def setTraceFile(traceFile: Path, backupCount: int = 2) -> None:
+        """Starts a new trace file, keeping the previous runs' ones as traceFile.1, .2..."""
+        paths = [traceFile] + [
+            traceFile.with_name(f"{traceFile.name}.{i}")
+            for i in range(1, backupCount + 1)
+        ]
+        paths[-1].unlink(missing_ok=True)
+        for source, destination in reversed(list(zip(paths, paths[1:]))):
+            if source.exists():
+                source.replace(destination)
+        Tracer.traceFile = traceFile
+
+    @staticmethod
+    @contextlib.contextmanager
+    def span(name: str, **attributes: Any) -> Iterator[None]:
+        startedAt = time.time()
+        start = time.perf_counter()
+        error: str | None = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            record = {
+                "name": name,
+                "startedAt": startedAt,
+                "duration": time.perf_counter() - start,
+                **Tracer.context,
+                **attributes,
+            }
+            if error:
+                record["error"] = error
+            Tracer.record(record)
+
+    @staticmethod
+    def traced(function: T) -> T:
+        """Decorator recording a span named after the function for each call."""
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with Tracer.span(function.__qualname__):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    @staticmethod
+    def record(record: dict[str, Any]) -> None:
+        with Tracer.lock:
+            Tracer.spans.append(record)
+            if Tracer.traceFile is not None:
+                with open(Tracer.traceFile, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(record, default=str) + "\n")
+
+    @staticmethod
+    def getSummary() -> str:
+        """Returns a table of the spans' count and durations, slowest in total first."""
+        durations: dict[str, list[float]] = defaultdict(list)
+        for span in Tracer.spans:
+            durations[span["name"]].append(span["duration"])
+        if not durations:
+            return "No spans recorded"
+        nameWidth = max(len(name) for name in durations)
+        lines = [
+            f"{'span':<{nameWidth}}  {'count':>5}  {'total':>9}  {'mean':>8}  {'max':>8}"
+        ]
+        for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+            lines.append(
+                f"{name:<{nameWidth}}  {len(values):>5}  {sum(values):>8.1f}s"
+                f"  {sum(values) / len(values):>7.2f}s  {max(values):>7.2f}s"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,77 @@
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+class TrendsQueue:
+    """
+    Persistent FIFO of search terms backed by SQLite.
+
+    Terms are ordered by an integer primary key, so getting the front, removing it or moving a
+    term to the back are index lookups instead of scanning the whole store. Terms are unique,
+    inserting one already queued is a no-op.
+    """
+
+    def __init__(self, path: Path):
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS terms ("
+                "position INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE)"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        for (term,) in self.connection.execute(
+            "SELECT term FROM terms ORDER BY position"
+        ):
+            yield term
+
+    def peek(self) -> str | None:
+        """Returns the term at the front of the queue without removing it."""
+        row = self.connection.execute(
+            "SELECT term FROM terms ORDER BY position LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+
+    def head(self, count: int) -> list[str]:
+        """Returns the first terms of the queue without removing them."""
+        return [
+            term
+            for (term,) in self.connection.execute(
+                "SELECT term FROM terms ORDER BY position LIMIT ?", (count,)
+            )
+        ]
+
+    def extend(self, terms: Iterable[str]) -> int:
+        """Appends the terms not already queued, returns how many were added."""
+        with self.connection:
+            cursor = self.connection.executemany(
+                "INSERT OR IGNORE INTO terms (term) VALUES (?)",
+                ((term,) for term in terms),
+            )
+        return cursor.rowcount
+
+    def remove(self, term: str) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM terms WHERE term = ?", (term,))
+
+    def rotate(self, term: str) -> None:
+        """Moves the term to the back of the queue."""
+        with self.connection:
+            self.connection.execute(
+                "UPDATE terms SET position = (SELECT MAX(position) + 1 FROM terms)"
+                " WHERE term = ?",
+                (term,),
+            )
@@ -1,9 +1,14 @@
+import logging
 import random
-from typing import Any
+import threading
+import time
+from typing import Any, Callable
 
 import requests
-from requests import HTTPError, Response
+from requests import HTTPError, Response, Session
 
+from src.config import CONFIG
+from src.constants import rewriteUrl
 from src.utils import Utils
 
 
@@ -31,6 +36,14 @@ class GenerateUserAgent:
     OS_PLATFORMS = {"win": "Windows NT 10.0", "android": "Linux"}
     OS_CPUS = {"win": "Win64; x64", "android": "Android 13"}
 
+    # Bump when the shape of the cached release lookups changes
+    RELEASES_CACHE_VERSION = 1
+    releasesCacheLock = threading.Lock()
+
+    def __init__(self, requestsSession: Session | None = None):
+        self.requestsSession = requestsSession or Utils.makeRequestsSession()
+        self.releasesCacheTtl: float = CONFIG.releasesTtl
+
     def userAgent(
         self,
         browserConfig: dict[str, Any] | None,
@@ -113,11 +126,13 @@ class GenerateUserAgent:
         Returns:
             A dictionary containing the application components for the user agent string.
         """
-        edgeWindowsVersion, edgeAndroidVersion = self.getEdgeVersions()
+        edgeWindowsVersion, edgeAndroidVersion = self.getCachedRelease(
+            "edge_versions", self.getEdgeVersions
+        )
         edgeVersion = edgeAndroidVersion if mobile else edgeWindowsVersion
         edgeMajorVersion = edgeVersion.split(".")[0]
 
-        chromeVersion = self.getChromeVersion()
+        chromeVersion = self.getCachedRelease("chrome_version", self.getChromeVersion)
         chromeMajorVersion = chromeVersion.split(".")[0]
         chromeReducedVersion = f"{chromeMajorVersion}.0.0.0"
 
@@ -129,6 +144,49 @@ class GenerateUserAgent:
             "chrome_reduced_version": chromeReducedVersion,
         }
 
+    def getCachedRelease(self, name: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns a release lookup from the on-disk cache. A stale entry is still returned right
+        away while it gets refreshed in the background, only a missing one blocks on the network.
+
+        Args:
+            name: The cache entry name.
+            fetch: The lookup to run when the entry is missing or stale.
+        """
+        entry = self.loadReleasesCache().get(name)
+        if entry is None:
+            return self.refreshCachedRelease(name, fetch)
+        if time.time() - entry["fetchedAt"] >= self.releasesCacheTtl:
+            threading.Thread(
+                target=self.refreshCachedRelease, args=(name, fetch, True), daemon=True
+            ).start()
+        return entry["value"]
+
+    def refreshCachedRelease(
+        self, name: str, fetch: Callable[[], Any], background: bool = False
+    ) -> Any:
+        try:
+            value = fetch()
+        except Exception:  # pylint: disable=broad-except
+            if not background:
+                raise
+            logging.debug(f"Keeping stale {name}", exc_info=True)
+            return None
+        with self.releasesCacheLock:
+            cache = self.loadReleasesCache()
+            cache[name] = {"fetchedAt": time.time(), "value": value}
+            Utils.saveCache(
+                "releases",
+                {"version": self.RELEASES_CACHE_VERSION, "entries": cache},
+            )
+        return value
+
+    def loadReleasesCache(self) -> dict[str, Any]:
+        cache = Utils.loadCache("releases")
+        if not cache or cache.get("version") != self.RELEASES_CACHE_VERSION:
+            return {}
+        return cache["entries"]
+
     def getEdgeVersions(self) -> tuple[str, str]:
         """
         Get the latest version of Microsoft Edge.
@@ -178,9 +236,8 @@ class GenerateUserAgent:
         data = response.json()
         return data["channels"]["Stable"]["version"]
 
-    @staticmethod
-    def getWebdriverPage(url: str) -> Response:
-        response = Utils.makeRequestsSession().get(url)
+    def getWebdriverPage(self, url: str) -> Response:
+        response = self.requestsSession.get(rewriteUrl(url))
         if response.status_code != requests.codes.ok:  # pylint: disable=no-member
             raise HTTPError(
                 f"Failed to get webdriver page {url}. "
@@ -6,14 +6,13 @@ import re
 import time
 from argparse import Namespace
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import requests
-import yaml
 from apprise import Apprise
 from requests import Session
 from requests.adapters import HTTPAdapter
-from selenium.common import NoSuchElementException, TimeoutException, ElementClickInterceptedException, \
+from selenium.common import TimeoutException, ElementClickInterceptedException, \
     ElementNotInteractableException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
@@ -22,45 +21,44 @@ from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.wait import WebDriverWait
 from urllib3 import Retry
 
+from .config import CONFIG, PRIVATE_CONFIG
+from .constants import REWARDS_API_URL
 from .constants import REWARDS_URL
+from .constants import rewriteUrl
 from .constants import SEARCH_URL
+from .messageDismisser import MessageDismisser
+from .tabManager import TabManager
+from .tracer import Tracer
 
 
 class Utils:
     args: Namespace
 
-    def __init__(self, webdriver: WebDriver):
+    def __init__(self, webdriver: WebDriver, requestsSession: Session | None = None):
         self.webdriver = webdriver
+        self.requestsSession = requestsSession or self.makeRequestsSession()
+        self.syncedCookies: dict[tuple[str, str, str], str] = {}
         with contextlib.suppress(Exception):
             locale = pylocale.getdefaultlocale()[0]
             pylocale.setlocale(pylocale.LC_NUMERIC, locale)
 
-        self.config = self.loadConfig()
+        self.config = CONFIG
+        self.messageDismisser = MessageDismisser(CONFIG.browserDismissSelectors)
+        self.tabs = TabManager(webdriver)
+        self.rewardsReloadPending = False
+        self.dashboardData: dict | None = None
+        self.dashboardDataTimestamp: float = 0
 
     @staticmethod
     def getProjectRoot() -> Path:
         return Path(__file__).parent.parent
 
-    @staticmethod
-    def loadConfig(configFilename="config.yaml") -> dict:
-        configFile = Utils.getProjectRoot() / configFilename
-        try:
-            with open(configFile, "r") as file:
-                config = yaml.safe_load(file)
-                if not config:
-                    logging.info(f"{file} doesn't exist")
-                    return {}
-                return config
-        except OSError:
-            logging.warning(f"{configFilename} doesn't exist")
-            return {}
-
     @staticmethod
     def sendNotification(title, body) -> None:
         if Utils.args.disable_apprise:
             return
         apprise = Apprise()
-        urls: list[str] = Utils.loadConfig("config-private.yaml").get("apprise", {}).get("urls", [])
+        urls: list[str] = PRIVATE_CONFIG.appriseUrls
         if not urls:
             logging.debug("No urls found, not sending notification")
             return
@@ -82,10 +80,38 @@ class Utils:
             expected_conditions.element_to_be_clickable((by, selector))
         )
 
+    def waitUntil(
+        self, condition: Callable[[WebDriver], Any], timeToWait: float = 10
+    ) -> Any:
+        return WebDriverWait(self.webdriver, timeToWait).until(condition)
+
+    def waitUntilPageLoaded(
+        self, previousPageElement: WebElement | None = None, timeToWait: float = 20
+    ) -> None:
+        """
+        Waits for the current page to be fully loaded.
+
+        Args:
+            previousPageElement: An element of the page being navigated away from, if given
+                also waits for it to be gone so the previous page isn't mistaken for the new one.
+            timeToWait: The timeout of each wait.
+        """
+        if previousPageElement is not None:
+            self.waitUntil(expected_conditions.staleness_of(previousPageElement), timeToWait)
+        self.waitUntil(
+            lambda driver: driver.execute_script("return document.readyState")
+            == "complete",
+            timeToWait,
+        )
+
     def checkIfTextPresentAfterDelay(self, text: str, timeToWait: float = 10) -> bool:
-        time.sleep(timeToWait)
-        text_found = re.search(text, self.webdriver.page_source)
-        return text_found is not None
+        # Returns as soon as the text shows up instead of always waiting the full delay
+        with contextlib.suppress(TimeoutException):
+            self.waitUntil(
+                lambda driver: re.search(text, driver.page_source), timeToWait
+            )
+            return True
+        return False
 
     def waitUntilQuestionRefresh(self) -> WebElement:
         return self.waitUntilVisible(By.CLASS_NAME, "rqECredits", timeToWait=20)
@@ -94,24 +120,24 @@ class Utils:
         return self.waitUntilVisible(By.XPATH, '//*[@id="rqStartQuiz"]')
 
     def resetTabs(self) -> None:
-        curr = self.webdriver.current_window_handle
-
-        for handle in self.webdriver.window_handles:
-            if handle != curr:
-                self.webdriver.switch_to.window(handle)
-                time.sleep(0.5)
-                self.webdriver.close()
-                time.sleep(0.5)
-
-        self.webdriver.switch_to.window(curr)
-        time.sleep(0.5)
-        self.goToRewards()
+        """
+        Closes every tab but the main one after an error. The rewards page is only reloaded
+        when something needs it next, see `ensureOnRewards`.
+        """
+        self.tabs.closeOtherTabs()
+        self.rewardsReloadPending = True
 
     def goToRewards(self) -> None:
         self.webdriver.get(REWARDS_URL)
         assert (
             self.webdriver.current_url == REWARDS_URL
         ), f"{self.webdriver.current_url} {REWARDS_URL}"
+        self.rewardsReloadPending = False
+
+    def ensureOnRewards(self) -> None:
+        """Goes to the rewards page unless the main tab is already on it."""
+        if self.rewardsReloadPending or self.webdriver.current_url != REWARDS_URL:
+            self.goToRewards()
 
     def goToSearch(self) -> None:
         self.webdriver.get(SEARCH_URL)
@@ -121,49 +147,121 @@ class Utils:
 
     @staticmethod
     def getAnswerCode(key: str, string: str) -> str:
-        t = sum(ord(string[i]) for i in range(len(string)))
-        t += int(key[-2:], 16)
-        return str(t)
+        return Utils.getAnswerCodes(key, [string])[0]
 
-    def getDashboardData(self) -> dict:
+    @staticmethod
+    def getAnswerCodes(key: str, strings: list[str]) -> list[str]:
+        """
+        Returns the This or That answer codes of all a question's options at once, the sum of
+        their characters' code points plus the key's last byte.
+        quizEngine.ANSWER_CODES_SCRIPT is the in-page equivalent.
+        """
+        offset = int(key[-2:], 16)
+        return [str(sum(map(ord, string)) + offset) for string in strings]
+
+    @Tracer.traced
+    def getDashboardData(self, refresh: bool = False) -> dict:
+        """
+        Returns the rewards dashboard, reusing the last snapshot while it's fresh.
+
+        Args:
+            refresh: Force a new snapshot even if the cached one is still fresh.
+        """
+        if (
+            not refresh
+            and self.dashboardData is not None
+            and time.time() - self.dashboardDataTimestamp < self.config.dashboardMaxAge
+        ):
+            return self.dashboardData
+        self.dashboardData = self.fetchDashboardData()
+        self.dashboardDataTimestamp = time.time()
+        return self.dashboardData
+
+    def invalidateDashboardData(self) -> None:
+        """Drops the dashboard snapshot, call after anything that changes progress."""
+        self.dashboardData = None
+
+    @Tracer.traced
+    def fetchDashboardData(self) -> dict:
         urlBefore = self.webdriver.current_url
         try:
             self.goToRewards()
             return self.webdriver.execute_script("return dashboard")
         finally:
-            try:
-                self.webdriver.get(urlBefore)
-            except TimeoutException:
-                self.goToRewards()
+            if urlBefore != REWARDS_URL:  # Otherwise the reload already put us back
+                try:
+                    self.webdriver.get(urlBefore)
+                except TimeoutException:
+                    self.goToRewards()
 
+    @Tracer.traced
     def getBingInfo(self) -> Any:
-        session = self.makeRequestsSession()
-
-        for cookie in self.webdriver.get_cookies():
-            session.cookies.set(cookie["name"], cookie["value"])
+        session = self.getRequestsSessionWithCookies()
 
-        response = session.get("https://www.bing.com/rewards/panelflyout/getuserinfo")
+        response = session.get(
+            rewriteUrl("https://www.bing.com/rewards/panelflyout/getuserinfo")
+        )
 
         assert response.status_code == requests.codes.ok
         return response.json()["userInfo"]
 
+    def getUserStatus(self) -> dict:
+        """
+        Returns the dashboard's userStatus (search counters, level...) with a single request,
+        only falling back to loading the dashboard page if the api doesn't answer as expected.
+        """
+        session = self.getRequestsSessionWithCookies()
+        try:
+            response = session.get(REWARDS_API_URL)
+            assert response.status_code == requests.codes.ok
+            return response.json()["dashboard"]["userStatus"]
+        except (requests.RequestException, AssertionError, KeyError, TypeError, ValueError):
+            logging.debug("Falling back to dashboard for user status", exc_info=True)
+            return self.getDashboardData()["userStatus"]
+
+    def getRequestsSessionWithCookies(self) -> Session:
+        """
+        Returns the browser's requests session with its cookie jar synced from the webdriver,
+        only touching the cookies that changed since the last sync.
+        """
+        # Network.getAllCookies, unlike get_cookies, isn't limited to the current domain
+        cookies = self.webdriver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        currentCookies: dict[tuple[str, str, str], str] = {}
+        for cookie in cookies:
+            key = (cookie["domain"], cookie["path"], cookie["name"])
+            currentCookies[key] = cookie["value"]
+            if self.syncedCookies.get(key) != cookie["value"]:
+                self.requestsSession.cookies.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie["domain"],
+                    path=cookie["path"],
+                )
+        for domain, path, name in self.syncedCookies.keys() - currentCookies.keys():
+            with contextlib.suppress(KeyError):
+                self.requestsSession.cookies.clear(domain, path, name)
+        self.syncedCookies = currentCookies
+        return self.requestsSession
+
     @staticmethod
-    def makeRequestsSession(session: Session = requests.session()) -> Session:
+    def makeRequestsSession(session: Session | None = None) -> Session:
+        if session is None:
+            session = requests.session()
         retry = Retry(
             total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504]
         )
-        session.mount(
-            "https://", HTTPAdapter(max_retries=retry)
-        )  # See https://stackoverflow.com/a/35504626/4164390 to finetune
-        session.mount(
-            "http://", HTTPAdapter(max_retries=retry)
+        # Mounted once per session, connections are then kept alive and reused
+        adapter = HTTPAdapter(
+            max_retries=retry, pool_connections=10, pool_maxsize=10
         )  # See https://stackoverflow.com/a/35504626/4164390 to finetune
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         return session
 
     def isLoggedIn(self) -> bool:
         # return self.getBingInfo()["isRewardsUser"]  # todo For some reason doesn't work, but doesn't involve changing url so preferred
         self.webdriver.get(
-            "https://rewards.bing.com/Signin/"
+            rewriteUrl("https://rewards.bing.com/Signin/")
         )  # changed site to allow bypassing when M$ blocks access to login.live.com randomly
         with contextlib.suppress(TimeoutException):
             self.waitUntilVisible(
@@ -182,44 +280,13 @@ class Utils:
         return self.getDashboardData()["userStatus"]["redeemGoal"]["title"]
 
     def tryDismissAllMessages(self) -> None:
-        buttons = [
-            (By.ID, "iLandingViewAction"),
-            (By.ID, "iShowSkip"),
-            (By.ID, "iNext"),
-            (By.ID, "iLooksGood"),
-            (By.ID, "idSIButton9"),
-            (By.ID, "bnp_btn_accept"),
-            (By.ID, "acceptButton"),
-        ]
-        for button in buttons:
-            try:
-                elements = self.webdriver.find_elements(by=button[0], value=button[1])
-            except (NoSuchElementException, ElementNotInteractableException):  # Expected?
-                logging.debug("", exc_info=True)
-                continue
-            for element in elements:
-                element.click()
-        self.tryDismissCookieBanner()
-        self.tryDismissBingCookieBanner()
-
-    def tryDismissCookieBanner(self) -> None:
-        with contextlib.suppress(NoSuchElementException, ElementNotInteractableException):  # Expected
-            self.webdriver.find_element(By.ID, "cookie-banner").find_element(
-                By.TAG_NAME, "button"
-            ).click()
-
-    def tryDismissBingCookieBanner(self) -> None:
-        with contextlib.suppress(NoSuchElementException, ElementNotInteractableException):  # Expected
-            self.webdriver.find_element(By.ID, "bnp_btn_accept").click()
+        self.messageDismisser.dismiss(self.webdriver)
 
     def switchToNewTab(self, timeToWait: float = 0) -> None:
-        self.webdriver.switch_to.window(window_name=self.webdriver.window_handles[1])
+        self.tabs.switchToNewTab(timeToWait)
 
     def closeCurrentTab(self) -> None:
-        self.webdriver.close()
-        time.sleep(0.5)
-        self.webdriver.switch_to.window(window_name=self.webdriver.window_handles[0])
-        time.sleep(0.5)
+        self.tabs.closeCurrentTab()
 
     def visitNewTab(self, timeToWait: float = 0) -> None:
         self.switchToNewTab(timeToWait)
@@ -245,6 +312,27 @@ class Utils:
         with open(configFile, "w") as f:
             json.dump(config, f)
 
+    @staticmethod
+    def getCacheDir() -> Path:
+        cacheDir = Utils.getProjectRoot() / "cache"
+        cacheDir.mkdir(parents=True, exist_ok=True)
+        return cacheDir
+
+    @staticmethod
+    def loadCache(name: str) -> Any:
+        cacheFile = Utils.getCacheDir() / f"{name}.json"
+        try:
+            with open(cacheFile, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def saveCache(name: str, data: Any) -> None:
+        cacheFile = Utils.getCacheDir() / f"{name}.json"
+        with open(cacheFile, "w") as f:
+            json.dump(data, f)
+
     def click(self, element: WebElement) -> None:
         try:
             element.click()
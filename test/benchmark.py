@@ -0,0 +1,253 @@
+"""
+End to end benchmark of `executeBot` against the offline stand-in, see test/standInServer.py.
+
+The bot's own sleeps are compressed so a run takes seconds instead of minutes, then wall time,
+page navigations, HTTP requests, CPU time and peak RSS are reported per phase (the Tracer spans)
+and saved as JSON, to be diffed between commits:
+
+    python -m test.benchmark --output before.json
+    python -m test.benchmark --output after.json --baseline before.json
+
+Arguments it doesn't know are passed to the bot, ex: `python -m test.benchmark --single-browser`.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from test.standInServer import StandInRequest, StandInServer
+from typing import Any, Iterable
+from unittest.mock import patch
+
+import psutil
+
+ACCOUNT_USERNAME = "benchmark@example.com"
+REPORTED_METRICS = ["wallTime", "navigations", "httpRequests", "cpuTime", "peakRss"]
+
+
+@dataclass
+class ResourceSample:
+    time: float
+    cpuTime: float
+    rss: int
+
+
+class ResourceSampler(threading.Thread):
+    """Samples the CPU time and memory of this process and its children (Chrome, chromedriver)."""
+
+    def __init__(self, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.process = psutil.Process()
+        self.samples: list[ResourceSample] = []
+        # Per process, so the CPU time of a child that exited isn't lost
+        self.cpuTimeByPid: dict[int, float] = {}
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+        self.sample()
+
+    def sample(self) -> None:
+        rss = 0
+        for process in [self.process, *self.process.children(recursive=True)]:
+            with contextlib.suppress(psutil.NoSuchProcess, psutil.AccessDenied):
+                cpuTimes = process.cpu_times()
+                self.cpuTimeByPid[process.pid] = cpuTimes.user + cpuTimes.system
+                rss += process.memory_info().rss
+        self.samples.append(
+            ResourceSample(time.time(), sum(self.cpuTimeByPid.values()), rss)
+        )
+
+
+def measure(
+    start: float,
+    end: float,
+    samples: list[ResourceSample],
+    requests: list[StandInRequest],
+) -> dict[str, float]:
+    """Returns the metrics of the [start, end] window."""
+
+    def sampleAt(moment: float) -> ResourceSample:
+        return next(
+            (sample for sample in reversed(samples) if sample.time <= moment),
+            samples[0],
+        )
+
+    inWindow = [request for request in requests if start <= request.time <= end]
+    return {
+        "wallTime": end - start,
+        "navigations": sum(request.isNavigation for request in inWindow),
+        "httpRequests": len(inWindow),
+        "cpuTime": sampleAt(end).cpuTime - sampleAt(start).cpuTime,
+        "peakRss": max(
+            [sample.rss for sample in samples if start <= sample.time <= end]
+            or [sampleAt(start).rss]
+        ),
+    }
+
+
+def summarizePhases(
+    spans: Iterable[dict[str, Any]],
+    samples: list[ResourceSample],
+    requests: list[StandInRequest],
+) -> dict[str, dict[str, float]]:
+    """Sums the metrics of the spans sharing a name, peak RSS is the max of theirs."""
+    phases: dict[str, dict[str, float]] = {}
+    for span in spans:
+        metrics = measure(
+            span["startedAt"], span["startedAt"] + span["duration"], samples, requests
+        )
+        if (phase := phases.get(span["name"])) is None:
+            phases[span["name"]] = {"count": 1, **metrics}
+            continue
+        phase["count"] += 1
+        for name, value in metrics.items():
+            phase[name] = (
+                max(phase[name], value) if name == "peakRss" else phase[name] + value
+            )
+    return phases
+
+
+def formatReport(result: dict[str, Any], baseline: dict[str, Any] | None = None) -> str:
+    rows = {**result["phases"], "total": result["total"]}
+    nameWidth = max(len(name) for name in rows)
+    lines = [
+        f"{'phase':<{nameWidth}}  {'wall':>8}  {'navs':>5}  {'http':>5}  {'cpu':>8}  {'rss':>8}"
+    ]
+    for name, metrics in rows.items():
+        line = (
+            f"{name:<{nameWidth}}  {metrics['wallTime']:>7.2f}s  {metrics['navigations']:>5}"
+            f"  {metrics['httpRequests']:>5}  {metrics['cpuTime']:>7.2f}s"
+            f"  {metrics['peakRss'] / 1024 / 1024:>6.0f}MB"
+        )
+        if baseline is not None:
+            previous = (
+                baseline["total"] if name == "total" else baseline["phases"].get(name)
+            )
+            if previous is None:
+                line += "  (new)"
+            elif changes := [
+                f"{metric} {metrics[metric] - previous[metric]:+.2f}"
+                for metric in REPORTED_METRICS
+                if metrics[metric] != previous[metric]
+            ]:
+                line += f"  ({', '.join(changes)})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def getCommit() -> str | None:
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    return None
+
+
+def runBot(botArguments: list[str], timeCompression: float) -> None:
+    # Imported here, urls are rewritten to the stand-in when src is first imported
+    import main as bot  # pylint: disable=import-outside-toplevel
+    from src import Account  # pylint: disable=import-outside-toplevel
+    from src.utils import Utils  # pylint: disable=import-outside-toplevel
+
+    sleep = time.sleep
+
+    def compressedSleep(seconds: float) -> None:
+        # Only the bot's own sleeps, selenium's polling keeps its pace
+        caller = sys._getframe(1).f_globals.get(
+            "__name__", ""
+        )  # pylint: disable=protected-access
+        sleep(seconds * timeCompression if caller.startswith("src.") else seconds)
+
+    with patch.object(
+        sys,
+        "argv",
+        [
+            sys.argv[0],
+            "--lang",
+            "en",
+            "--geo",
+            "US",
+            "--disable-apprise",
+            *botArguments,
+        ],
+    ):
+        args = bot.argumentParser()
+    Utils.args = args
+    # A fresh project root each run, so caches and sessions don't make later runs faster
+    with tempfile.TemporaryDirectory() as root, patch.object(
+        Utils, "getProjectRoot", return_value=Path(root)
+    ), patch("time.sleep", compressedSleep):
+        bot.executeBot(Account(ACCOUNT_USERNAME, "benchmark"), args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="MS Rewards Farmer benchmark against the offline stand-in"
+    )
+    parser.add_argument("--output", type=Path, default=Path("benchmark.json"))
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Optional: Previous output to diff with",
+    )
+    parser.add_argument(
+        "--time-compression",
+        type=float,
+        default=0.01,
+        help="Optional: Factor applied to the bot's sleeps",
+    )
+    args, botArguments = parser.parse_known_args()
+
+    with StandInServer() as server:
+        os.environ["MS_REWARDS_STAND_IN_URL"] = server.url
+        # The stand-in is plain http
+        os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+        from src.tracer import Tracer  # pylint: disable=import-outside-toplevel
+
+        sampler = ResourceSampler()
+        sampler.sample()
+        sampler.start()
+        start = time.time()
+        try:
+            runBot(botArguments, args.time_compression)
+        finally:
+            end = time.time()
+            sampler.stop()
+        requests = list(server.requests)
+
+    result = {
+        "commit": getCommit(),
+        "timeCompression": args.time_compression,
+        "botArguments": botArguments,
+        "phases": summarizePhases(Tracer.spans, sampler.samples, requests),
+        "total": measure(start, end, sampler.samples, requests),
+        "requests": [asdict(request) for request in requests],
+    }
+    args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    baseline = (
+        json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    )
+    print(formatReport(result, baseline))
+    print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Local stand-in for the Microsoft Rewards, Bing and Google Trends endpoints, serving the pages and
+payloads in test/fixtures so flows can run offline and be benchmarked deterministically.
+
+Start it with `python -m test.standInServer --port 8080`, then run the bot with
+`MS_REWARDS_STAND_IN_URL=http://127.0.0.1:8080` (and `OAUTHLIB_INSECURE_TRANSPORT=1` for Read to
+Earn) so every url is rewritten to it, see `src.constants.rewriteUrl`.
+"""
+
+import argparse
+import copy
+import html
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Counters credited by each search, matches the fixture's 30 points max of 3 points searches
+SEARCH_POINTS = 3
+# Read to Earn articles credited before the balance stops moving
+ARTICLES_TO_READ = 3
+
+
+HTML_TYPE = "text/html; charset=utf-8"
+JSON_TYPE = "application/json"
+# Status, content type, body and headers of a response
+Response = tuple[int, str, bytes, dict[str, str]]
+NOT_FOUND: Response = (HTTPStatus.NOT_FOUND, HTML_TYPE, b"Not found", {})
+
+
+def loadFixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def page(text: str) -> Response:
+    return HTTPStatus.OK, HTML_TYPE, text.encode(), {}
+
+
+def payload(data: Any) -> Response:
+    return HTTPStatus.OK, JSON_TYPE, json.dumps(data).encode(), {}
+
+
+@dataclass
+class StandInState:
+    """What the bot changed on the stand-in, so progress shows up in later responses."""
+
+    balance: int = 1000
+    pcSearchProgress: int = 21
+    mobileSearchProgress: int = 14
+    completedOffers: set[str] = field(default_factory=set)
+    articlesRead: int = 0
+
+
+@dataclass
+class StandInRequest:
+    time: float
+    method: str
+    host: str
+    path: str
+    status: int
+    contentType: str
+
+    @property
+    def isNavigation(self) -> bool:
+        # Only pages are served as html, everything else the bot fetches is json
+        return self.contentType.startswith("text/html") and self.status < 400
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.state = StandInState()
+        self.requests: list[StandInRequest] = []
+        self.lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "StandInServer":
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def render(self, text: str, **values: str) -> str:
+        values = {
+            "BASE": self.url,
+            "TODAY": datetime.now().strftime("%m/%d/%Y"),
+            **values,
+        }
+        for name, value in values.items():
+            text = text.replace(f"{{{{{name}}}}}", value)
+        return text
+
+    def getDashboard(self) -> dict:
+        dashboard = json.loads(self.render(loadFixture("dashboard.json")))
+        counters = dashboard["userStatus"]["counters"]
+        counters["pcSearch"][0]["pointProgress"] = self.state.pcSearchProgress
+        counters["mobileSearch"][0]["pointProgress"] = self.state.mobileSearchProgress
+        dashboard["userStatus"]["availablePoints"] = self.state.balance
+        promotions = [
+            *(p for day in dashboard["dailySetPromotions"].values() for p in day),
+            *dashboard["morePromotions"],
+            dashboard["promotionalItem"],
+        ]
+        for promotion in promotions:
+            if promotion["offerId"] in self.state.completedOffers:
+                promotion["complete"] = True
+                promotion["pointProgress"] = promotion["pointProgressMax"]
+        return dashboard
+
+    def renderRewards(self) -> str:
+        dashboard = self.getDashboard()
+        dailySetCards = "".join(
+            "<mee-card><div><card-content><mee-rewards-daily-set-item-content><div>"
+            f'<a href="{html.escape(activity["destinationUrl"])}" target="_blank">'
+            f'{html.escape(activity["title"])}</a>'
+            "</div></mee-rewards-daily-set-item-content></card-content></div></mee-card>"
+            for day in dashboard["dailySetPromotions"].values()
+            for activity in day
+        )
+        morePromotionsCards = "".join(
+            '<div class="ng-scope">'
+            f'<a class="ds-card-sec" href="{html.escape(promotion["destinationUrl"])}"'
+            f' target="_blank">{html.escape(promotion["title"])}</a></div>'
+            for promotion in dashboard["morePromotions"]
+        )
+        return self.render(
+            loadFixture("rewards.html"),
+            DASHBOARD=json.dumps(copy.deepcopy(dashboard)),
+            DAILY_SET_CARDS=dailySetCards,
+            MORE_PROMOTIONS_CARDS=morePromotionsCards,
+        )
+
+    def creditSearch(self, mobile: bool) -> None:
+        dashboard = json.loads(loadFixture("dashboard.json"))
+        counters = dashboard["userStatus"]["counters"]
+        if mobile:
+            target = counters["mobileSearch"][0]["pointProgressMax"]
+            if self.state.mobileSearchProgress < target:
+                self.state.mobileSearchProgress += SEARCH_POINTS
+                self.state.balance += SEARCH_POINTS
+        else:
+            target = counters["pcSearch"][0]["pointProgressMax"]
+            if self.state.pcSearchProgress < target:
+                self.state.pcSearchProgress += SEARCH_POINTS
+                self.state.balance += SEARCH_POINTS
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self) -> None:
+        self.handle_request("GET")
+
+    def do_POST(self) -> None:
+        self.handle_request("POST")
+
+    def handle_request(self, method: str) -> None:
+        url = urlsplit(self.path)
+        host, _, path = url.path.lstrip("/").partition("/")
+        path = f"/{path}"
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        if method == "POST":
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            status, contentType, body, headers = self.route(method, host, path, query)
+            self.server.requests.append(
+                StandInRequest(time.time(), method, host, path, status, contentType)
+            )
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route(
+        self, method: str, host: str, path: str, query: dict[str, str]
+    ) -> Response:
+        if (handler := HOST_ROUTES.get(host)) is None:
+            return NOT_FOUND
+        return handler(self, method, path, query)
+
+    def routeRewards(self, method: str, path: str, query: dict[str, str]) -> Response:
+        if path.startswith("/api/getuserinfo"):
+            return payload({"dashboard": self.server.getDashboard()})
+        return page(self.server.renderRewards())
+
+    def routeBing(self, method: str, path: str, query: dict[str, str]) -> Response:
+        server, state = self.server, self.server.state
+        if path == "/rewards/panelflyout/getuserinfo":
+            return payload(
+                {"userInfo": {"balance": state.balance, "isRewardsUser": True}}
+            )
+        if path == "/quiz":
+            state.completedOffers.add(query.get("offerId", ""))
+            return page(
+                server.render(
+                    loadFixture("quiz.html"),
+                    CORRECT_ANSWER=html.escape(query.get("correctAnswer", "")),
+                )
+            )
+        if path == "/search":
+            if "offerId" in query:
+                state.completedOffers.add(query["offerId"])
+            else:
+                server.creditSearch("Mobile" in self.headers.get("User-Agent", ""))
+        return page(
+            server.render(
+                loadFixture("search.html"), QUERY=html.escape(query.get("q", ""))
+            )
+        )
+
+    def routeBingApi(self, method: str, path: str, query: dict[str, str]) -> Response:
+        term = query.get("query", "")
+        return payload([term, [term, f"{term} news", f"{term} today"]])
+
+    def routeTrends(self, method: str, path: str, query: dict[str, str]) -> Response:
+        day = query.get("ed", "")
+        body = ")]}',\n" + self.server.render(loadFixture("dailytrends.json"), DAY=day)
+        return HTTPStatus.OK, JSON_TYPE, body.encode(), {}
+
+    def routeEdgeUpdates(
+        self, method: str, path: str, query: dict[str, str]
+    ) -> Response:
+        return HTTPStatus.OK, JSON_TYPE, loadFixture("edge_products.json").encode(), {}
+
+    def routeChromeLabs(
+        self, method: str, path: str, query: dict[str, str]
+    ) -> Response:
+        return (
+            HTTPStatus.OK,
+            JSON_TYPE,
+            loadFixture("chrome_versions.json").encode(),
+            {},
+        )
+
+    def routeLogin(self, method: str, path: str, query: dict[str, str]) -> Response:
+        if path == "/oauth20_authorize.srf":
+            location = (
+                f"{self.server.url}/login.live.com/oauth20_desktop.srf?code=standin"
+            )
+            return HTTPStatus.FOUND, HTML_TYPE, b"", {"Location": location}
+        return page("<html><body>Signed in</body></html>")
+
+    def routeToken(self, method: str, path: str, query: dict[str, str]) -> Response:
+        return payload(
+            {
+                "access_token": "standin",
+                "refresh_token": "standin",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+            }
+        )
+
+    def routeRewardsPlatform(
+        self, method: str, path: str, query: dict[str, str]
+    ) -> Response:
+        if method != "POST":
+            return NOT_FOUND
+        state = self.server.state
+        if state.articlesRead <= ARTICLES_TO_READ:
+            state.articlesRead += 1
+            state.balance += 1
+        return payload({"response": {"balance": state.balance}})
+
+
+# What each host stood in for is served by
+HOST_ROUTES: dict[
+    str, Callable[[StandInHandler, str, str, dict[str, str]], Response]
+] = {
+    "rewards.bing.com": StandInHandler.routeRewards,
+    "bing.com": StandInHandler.routeBing,
+    "www.bing.com": StandInHandler.routeBing,
+    "api.bing.com": StandInHandler.routeBingApi,
+    "trends.google.com": StandInHandler.routeTrends,
+    "edgeupdates.microsoft.com": StandInHandler.routeEdgeUpdates,
+    "googlechromelabs.github.io": StandInHandler.routeChromeLabs,
+    "login.live.com": StandInHandler.routeLogin,
+    "login.microsoftonline.com": StandInHandler.routeToken,
+    "prod.rewardsplatform.microsoft.com": StandInHandler.routeRewardsPlatform,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MS Rewards Farmer offline stand-in")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    with StandInServer(args.port) as server:
+        print(f"Serving fixtures, run with MS_REWARDS_STAND_IN_URL={server.url}")
+        assert server.thread is not None
+        server.thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from src.activityPlanner import ActivityCategory, ActivityPlanner
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def promotion(offerId: str, url: str, complete: bool = False) -> dict:
+    return {
+        "offerId": offerId,
+        "title": offerId,
+        "promotionType": "urlreward",
+        "complete": complete,
+        "pointProgress": 0,
+        "pointProgressMax": 10,
+        "destinationUrl": url,
+    }
+
+
+class TestActivityPlanner(TestCase):
+    def test_completed_activities_are_skipped(self):
+        dashboard = json.loads(
+            (FIXTURES_DIR / "dashboard.json")
+            .read_text(encoding="utf-8")
+            .replace("{{TODAY}}", datetime.now().strftime("%m/%d/%Y"))
+            .replace("{{BASE}}", "https://standin")
+        )
+        tasks = ActivityPlanner.plan(dashboard)
+        self.assertEqual(
+            [(task.category, task.offerId, task.cardId) for task in tasks],
+            [
+                (ActivityCategory.DAILY_SET, "Gamification_DailySet_Child1", 1),
+                (ActivityCategory.DAILY_SET, "Gamification_DailySet_Child2", 2),
+                (ActivityCategory.DAILY_SET, "Gamification_DailySet_Child3", 3),
+                (ActivityCategory.MORE_PROMOTIONS, "ENUS_morePromotions_lyrics", 0),
+            ],
+        )
+
+    def test_tasks_are_grouped_by_host(self):
+        today = datetime.now().strftime("%m/%d/%Y")
+        dashboard = {
+            "dailySetPromotions": {
+                today: [
+                    promotion("DailySet_Child1", "https://www.bing.com/search?q=a"),
+                    promotion("DailySet_Child2", "https://www.msn.com/quiz"),
+                ]
+            },
+            "punchCards": [
+                {
+                    "parentPromotion": {
+                        "offerId": "punchCard",
+                        "title": "Punch card",
+                        "complete": False,
+                        "pointProgressMax": 100,
+                        "attributes": {"destination": "https://www.bing.com/punchcard"},
+                    },
+                    "childPromotions": [promotion("child", "https://www.bing.com/")],
+                }
+            ],
+            "morePromotions": [
+                promotion("done", "https://www.bing.com/search?q=b", complete=True),
+                promotion("more", "https://www.bing.com/search?q=c"),
+            ],
+        }
+        tasks = ActivityPlanner.plan(dashboard)
+        self.assertEqual(
+            [(task.offerId, task.cardId) for task in tasks],
+            [
+                ("DailySet_Child1", 1),
+                ("more", 1),
+                ("DailySet_Child2", 2),
+                ("punchCard", 0),
+            ],
+        )
+        self.assertFalse(tasks[-1].startsFromRewards)
+
+    def test_punch_cards_without_offer_id_have_distinct_ids(self):
+        def punchCard(url: str) -> dict:
+            return {
+                "parentPromotion": {
+                    "complete": False,
+                    "pointProgressMax": 100,
+                    "attributes": {"destination": url},
+                },
+                "childPromotions": [promotion("child", "https://www.bing.com/")],
+            }
+
+        tasks = ActivityPlanner.planPunchCards(
+            {
+                "punchCards": [
+                    punchCard("https://rewards.bing.com/punchcard/first"),
+                    punchCard("https://rewards.bing.com/punchcard/second"),
+                ]
+            }
+        )
+        self.assertEqual(len({task.id for task in tasks}), 2)
+
+    def test_failed_tasks_are_not_journaled(self):
+        journal = MagicMock()
+        planner = ActivityPlanner(MagicMock(), journal)
+        tasks = ActivityPlanner.planMorePromotions(
+            {
+                "morePromotions": [
+                    promotion("works", "https://www.bing.com/search?q=a"),
+                    promotion("fails", "https://www.bing.com/search?q=b"),
+                ]
+            }
+        )
+        planner.morePromotions.completeMorePromotion = MagicMock(
+            side_effect=[None, Exception]
+        )
+        self.assertFalse(planner.runPlan(tasks))
+        journal.markTaskDone.assert_called_once_with("MORE_PROMOTIONS:works")
+
+    def test_promotional_item_failures_are_tolerated(self):
+        planner = ActivityPlanner(MagicMock())
+        planner.punchCards.completePromotionalItem = MagicMock(side_effect=Exception)
+        item = promotion("promo", "https://www.bing.com/search?q=a")
+        item["pointProgressMax"] = 100
+        tasks = ActivityPlanner.planPromotionalItem({"promotionalItem": item})
+        with self.assertLogs(level="DEBUG") as logs:
+            # A resumed run doesn't relaunch desktop just to retry it
+            self.assertTrue(planner.runPlan(tasks))
+        self.assertEqual({record.levelname for record in logs.records}, {"DEBUG"})
@@ -0,0 +1,66 @@
+from test.benchmark import ResourceSample, formatReport, measure, summarizePhases
+from test.standInServer import StandInRequest
+from unittest import TestCase
+
+
+class TestBenchmark(TestCase):
+    samples = [
+        ResourceSample(100.0, 1.0, 100),
+        ResourceSample(101.0, 1.5, 300),
+        ResourceSample(102.0, 2.5, 200),
+        ResourceSample(103.0, 3.0, 100),
+    ]
+    requests = [
+        StandInRequest(100.5, "GET", "rewards.bing.com", "/", 200, "text/html"),
+        StandInRequest(
+            100.6,
+            "GET",
+            "rewards.bing.com",
+            "/api/getuserinfo",
+            200,
+            "application/json",
+        ),
+        StandInRequest(102.5, "GET", "www.bing.com", "/search", 200, "text/html"),
+        StandInRequest(102.6, "GET", "favicon.ico", "/", 404, "text/html"),
+    ]
+
+    def test_window_is_measured(self):
+        metrics = measure(100.2, 101.2, self.samples, self.requests)
+        self.assertAlmostEqual(metrics["wallTime"], 1.0)
+        self.assertEqual(metrics["navigations"], 1)
+        self.assertEqual(metrics["httpRequests"], 2)
+        self.assertAlmostEqual(metrics["cpuTime"], 0.5)
+        self.assertEqual(metrics["peakRss"], 300)
+
+    def test_spans_are_summed_per_phase(self):
+        spans = [
+            {
+                "name": "Searches.bingSearch attempt",
+                "startedAt": 100.2,
+                "duration": 1.0,
+            },
+            {
+                "name": "Searches.bingSearch attempt",
+                "startedAt": 102.2,
+                "duration": 0.6,
+            },
+            {"name": "Login.login", "startedAt": 103.0, "duration": 0.0},
+        ]
+        phases = summarizePhases(spans, self.samples, self.requests)
+        self.assertEqual(phases["Searches.bingSearch attempt"]["count"], 2)
+        self.assertEqual(phases["Searches.bingSearch attempt"]["navigations"], 2)
+        self.assertEqual(phases["Searches.bingSearch attempt"]["httpRequests"], 4)
+        self.assertEqual(phases["Searches.bingSearch attempt"]["peakRss"], 300)
+        self.assertEqual(phases["Login.login"]["httpRequests"], 0)
+
+        result = {
+            "phases": phases,
+            "total": measure(100, 103, self.samples, self.requests),
+        }
+        baseline = {
+            "phases": {"Login.login": phases["Login.login"]},
+            "total": {**result["total"], "navigations": 1},
+        }
+        report = formatReport(result, baseline).splitlines()
+        self.assertIn("(new)", report[1])
+        self.assertIn("navigations +1.00", report[-1])
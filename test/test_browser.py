@@ -0,0 +1,37 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from src.browser import HIDE_WEBDRIVER_SCRIPT, Browser
+
+
+class TestBrowser(TestCase):
+    @unittest.skipIf(os.name == "nt", "reads the version from the folder on Windows")
+    def test_read_chrome_version_without_launching(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            binary = Path(tmp) / "google-chrome"
+            binary.write_text("#!/bin/sh\necho 'Google Chrome 120.0.6099.109 '\n")
+            binary.chmod(binary.stat().st_mode | stat.S_IEXEC)
+            self.assertEqual(Browser.readChromeVersion(str(binary)), "120.0.6099.109")
+
+    def test_webdriver_flag_is_hidden_after_switching_persona(self):
+        browser = Browser.__new__(Browser)
+        browser.webdriver = MagicMock()
+
+        browser.webdriver.execute_script.side_effect = [False]
+        browser.ensureWebdriverHidden()
+        browser.webdriver.execute_cdp_cmd.assert_not_called()
+
+        browser.webdriver.execute_script.side_effect = [True, False]
+        browser.ensureWebdriverHidden()
+        browser.webdriver.execute_cdp_cmd.assert_called_once_with(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_SCRIPT}
+        )
+
+        browser.webdriver.execute_script.side_effect = [True, True]
+        with self.assertRaises(RuntimeError):
+            browser.ensureWebdriverHidden()
@@ -0,0 +1,77 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from src.commandCounter import SRC_DIR, CommandCounter
+
+
+def callFrom(module: str, function):
+    # Runs the function from a frame that looks like it belongs to src/<module>.py
+    namespace = {"function": function}
+    exec(
+        compile("result = function()", str(SRC_DIR / f"{module}.py"), "exec"), namespace
+    )
+    return namespace["result"]
+
+
+class TestCommandCounter(TestCase):
+    def setUp(self):
+        self.counter = CommandCounter()
+        self.driver = MagicMock()
+        self.driverExecute = self.driver.execute
+        self.counter.instrumentWebdriver(self.driver)
+
+    def test_commands_are_credited_to_the_calling_module(self):
+        callFrom("dailySet", lambda: self.driver.execute("get", {"url": "x"}))
+        # utils is a helper, dailySet made the call
+        callFrom(
+            "dailySet",
+            lambda: callFrom("utils", lambda: self.driver.execute("findElement", {})),
+        )
+        callFrom("searches", lambda: self.driver.execute("executeCdpCommand", {}))
+        callFrom("searches", lambda: self.driver.execute("getCurrentUrl", {}))
+
+        self.assertEqual(
+            self.counter.counts,
+            {
+                ("dailySet", "get"): 1,
+                ("dailySet", "find_element"): 1,
+                ("searches", "cdp"): 1,
+            },
+        )
+        self.assertEqual(self.driverExecute.call_count, 4)
+
+    def test_requests_are_counted_and_formatted(self):
+        session = MagicMock()
+        self.counter.instrumentSession(session)
+        callFrom("searches", lambda: session.request("GET", "https://bing.com"))
+        callFrom("searches", lambda: session.request("GET", "https://bing.com"))
+        callFrom("punchCards", lambda: self.driver.execute("w3cExecuteScript", {}))
+
+        self.assertEqual(
+            CommandCounter.formatCounts(CommandCounter.merge([self.counter])),
+            "searches: get 0, execute_script 0, find_element 0, cdp 0, requests 2\n"
+            "punchCards: get 0, execute_script 1, find_element 0, cdp 0, requests 0",
+        )
+
+    def test_planner_and_helpers_credit_the_activity(self):
+        callFrom(
+            "activityPlanner",
+            lambda: callFrom(
+                "dailySet",
+                lambda: callFrom(
+                    "quizEngine", lambda: self.driver.execute("findElement", {})
+                ),
+            ),
+        )
+        with CommandCounter.creditTo("morePromotions"):
+            callFrom("activityPlanner", lambda: self.driver.execute("get", {}))
+        callFrom("tabManager", lambda: self.driver.execute("get", {}))
+
+        self.assertEqual(
+            self.counter.counts,
+            {
+                ("dailySet", "find_element"): 1,
+                ("morePromotions", "get"): 1,
+                ("other", "get"): 1,
+            },
+        )
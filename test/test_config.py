@@ -0,0 +1,49 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.config import Config
+
+
+class TestConfig(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config = Config("config.yaml")
+        self.config.path = Path(tmp.name) / "config.yaml"
+
+    def test_parsed_once_until_modified(self):
+        self.config.path.write_text("retries:\n  max: 3\n")
+        with patch("yaml.safe_load", wraps=__import__("yaml").safe_load) as safeLoad:
+            self.assertEqual(self.config.retriesMax, 3)
+            self.assertEqual(self.config.retriesMax, 3)
+            self.assertEqual(safeLoad.call_count, 1)
+
+            self.config.path.write_text("retries:\n  max: 5\n")
+            os.utime(self.config.path, (0, 0))
+            self.assertEqual(self.config.retriesMax, 5)
+            self.assertEqual(safeLoad.call_count, 2)
+
+    def test_missing_file_uses_defaults(self):
+        self.assertEqual(self.config.appriseSummary, "ALWAYS")
+        self.assertEqual(self.config.appriseUrls, [])
+
+    def test_invalid_value_is_rejected(self):
+        self.config.path.write_text("retries:\n  max: many\n")
+        with self.assertRaises(ValueError):
+            self.config.data
+
+    def test_value_outside_choices_is_rejected(self):
+        self.config.path.write_text("browser:\n  selenium_wire: alway\n")
+        with self.assertRaises(ValueError):
+            self.config.data
+
+    def test_enum_values_are_checked(self):
+        self.config.path.write_text("retries:\n  strategy: EXPONENTAIL\n")
+        with self.assertRaises(ValueError):
+            self.config.data
+        self.config.path.write_text("apprise:\n  summary: ON_ERROR\n")
+        os.utime(self.config.path, (0, 0))
+        self.assertEqual(self.config.appriseSummary, "ON_ERROR")
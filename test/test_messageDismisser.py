@@ -0,0 +1,26 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from selenium.common import StaleElementReferenceException
+from src.messageDismisser import FIND_VISIBLE_SCRIPT, MessageDismisser
+
+
+class TestMessageDismisser(TestCase):
+    def setUp(self):
+        self.dismisser = MessageDismisser(["#iNext", "#bnp_btn_accept"])
+        self.driver = MagicMock()
+
+    def test_nothing_shown_costs_one_call(self):
+        self.driver.execute_script.return_value = []
+        self.assertEqual(self.dismisser.dismiss(self.driver), 0)
+        self.driver.execute_script.assert_called_once_with(
+            FIND_VISIBLE_SCRIPT, ["#iNext", "#bnp_btn_accept"]
+        )
+
+    def test_visible_messages_are_clicked(self):
+        gone = MagicMock()
+        gone.click.side_effect = StaleElementReferenceException
+        shown = MagicMock()
+        self.driver.execute_script.return_value = [gone, shown]
+        self.assertEqual(self.dismisser.dismiss(self.driver), 1)
+        shown.click.assert_called_once()
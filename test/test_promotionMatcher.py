@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from src.constants import DEFAULT_PROMOTION_SEARCHES
+from src.promotionMatcher import PromotionMatcher
+
+
+class TestPromotionMatcher(TestCase):
+    def setUp(self):
+        self.matcher = PromotionMatcher(
+            {
+                **DEFAULT_PROMOTION_SEARCHES,
+                "ENUS_morePromotions_weather": "weather tomorrow",
+                "Who won the match?": "champions league score",
+            }
+        )
+
+    def test_titles_are_normalised(self):
+        self.assertEqual(
+            self.matcher.match({"title": "\u200bSearch the lyrics\xa0of a song!"}),
+            "black sabbath supernaut lyrics",
+        )
+        self.assertEqual(
+            self.matcher.match({"title": "Let\u2019s watch that movie again!"}),
+            "aliens movie",
+        )
+
+    def test_offer_id_wins_over_title(self):
+        self.assertEqual(
+            self.matcher.match(
+                {"offerId": "ENUS_morePromotions_weather", "title": "Gaming time"}
+            ),
+            "weather tomorrow",
+        )
+
+    def test_longest_key_wins(self):
+        self.assertEqual(
+            self.matcher.match({"title": "Who won the match? Find out"}),
+            "champions league score",
+        )
+        self.assertEqual(self.matcher.match({"title": "Who won?"}), "braves score")
+
+    def test_unknown_promotion(self):
+        self.assertIsNone(self.matcher.match({"offerId": "x", "title": "Daily poll"}))
+        self.assertIsNone(PromotionMatcher({}).match({"title": "Gaming time"}))
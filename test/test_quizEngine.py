@@ -0,0 +1,143 @@
+import json
+import shutil
+import subprocess
+from html.parser import HTMLParser
+from pathlib import Path
+from unittest import TestCase, skipUnless
+from unittest.mock import MagicMock
+
+from src.quizEngine import QUIZ_STATE_SCRIPT, QuizEngine, QuizState
+from src.utils import Utils
+
+QUIZ_FIXTURE = Path(__file__).parent / "fixtures" / "quiz.html"
+
+
+def quizState(numberOfOptions: int, correctAnswer: str, correctOptions=()) -> dict:
+    # Same shape as QUIZ_STATE_SCRIPT returns, TestQuizStateScript runs the script itself
+    titles = ["Cats", "B", "C", "D", "E", "F", "G", "H"][:numberOfOptions]
+    return {
+        "currentQuestionNumber": 1,
+        "maxQuestions": 3,
+        "numberOfOptions": numberOfOptions,
+        "correctAnswer": correctAnswer,
+        "encodeKey": "ABCDEF0123456789AB",
+        "options": [
+            {
+                "id": f"rqAnswerOption{i}",
+                "title": title,
+                "isCorrect": i in correctOptions,
+            }
+            for i, title in enumerate(titles)
+        ],
+    }
+
+
+class TestQuizEngine(TestCase):
+    def setUp(self):
+        self.browser = MagicMock()
+        self.engine = QuizEngine(self.browser)
+
+    def readState(self, result: dict):
+        self.browser.webdriver.execute_script.return_value = result
+        state = self.engine.readState()
+        self.browser.webdriver.execute_script.assert_called_once_with(QUIZ_STATE_SCRIPT)
+        self.browser.webdriver.execute_script.reset_mock()
+        return state
+
+    def test_single_answer_is_matched_on_its_option(self):
+        state = self.readState(quizState(4, "B"))
+        self.assertEqual(state.maxQuestions, 3)
+        self.assertEqual(state.getTargets(), ["rqAnswerOption1"])
+
+    def test_every_correct_option_is_targeted(self):
+        state = self.readState(quizState(8, "", correctOptions=(2, 5)))
+        self.assertEqual(state.getTargets(), ["rqAnswerOption2", "rqAnswerOption5"])
+
+    def test_this_or_that_is_matched_on_answer_code(self):
+        state = self.readState(quizState(2, "566"))
+        self.assertEqual(state.getThisOrThatTarget(), "rqAnswerOption0")
+        state = self.readState(quizState(2, "0"))
+        self.assertIsNone(state.getThisOrThatTarget())
+
+    def test_option_is_clicked_through_utils(self):
+        self.engine.clickOption("rqAnswerOption1")
+        self.browser.utils.click.assert_called_once_with(
+            self.browser.webdriver.find_element.return_value
+        )
+
+    def test_in_page_answer_codes_are_preferred(self):
+        result = quizState(2, "1")
+        for option, answerCode in zip(result["options"], ["0", "1"]):
+            option["answerCode"] = answerCode
+        state = self.readState(result)
+        self.assertEqual(state.getThisOrThatTarget(), "rqAnswerOption1")
+
+
+class ElementsById(HTMLParser):
+    """Attributes of the elements having an id, and the inline scripts of a page."""
+
+    def __init__(self, page: str):
+        super().__init__()
+        self.elements: dict[str, dict[str, str | None]] = {}
+        self.scripts: list[str] = []
+        self.inScript = False
+        self.feed(page)
+
+    def handle_starttag(self, tag, attrs):
+        self.inScript = tag == "script"
+        if (attributes := dict(attrs)).get("id"):
+            self.elements[attributes["id"]] = attributes
+
+    def handle_endtag(self, tag):
+        self.inScript = False
+
+    def handle_data(self, data):
+        if self.inScript:
+            self.scripts.append(data)
+
+
+@skipUnless(shutil.which("node"), "needs node to run the in-page scripts")
+class TestQuizStateScript(TestCase):
+    """Runs QUIZ_STATE_SCRIPT on test/fixtures/quiz.html, with just enough of a DOM for it."""
+
+    def runScript(self, correctAnswer: str) -> dict:
+        page = ElementsById(
+            QUIZ_FIXTURE.read_text(encoding="utf-8").replace(
+                "{{CORRECT_ANSWER}}", correctAnswer
+            )
+        )
+        program = f"""
+const elements = {json.dumps(page.elements)};
+const document = {{
+    getElementById: (id) => id in elements
+        ? {{id: id, getAttribute: (name) => elements[id][name] ?? null}}
+        : null,
+}};
+{"".join(page.scripts)}
+console.log(JSON.stringify((function () {{ {QUIZ_STATE_SCRIPT} }})()));
+"""
+        return json.loads(
+            subprocess.run(
+                ["node"], input=program, capture_output=True, text=True, check=True
+            ).stdout
+        )
+
+    def test_state_of_quiz_fixture(self):
+        result = self.runScript("B")
+        self.assertEqual(result["encodeKey"], "ABCDEF0123456789AB")
+        self.assertEqual(
+            [(option["title"], option["isCorrect"]) for option in result["options"]],
+            [("Cats", False), ("B", True), ("C", False), ("D", False)],
+        )
+        self.assertEqual(QuizState.fromScript(result).getTargets(), ["rqAnswerOption1"])
+
+    def test_in_page_answer_codes_match_utils(self):
+        result = self.runScript("566")
+        titles = [option["title"] for option in result["options"]]
+        self.assertEqual(
+            [option["answerCode"] for option in result["options"]],
+            Utils.getAnswerCodes(result["encodeKey"], titles),
+        )
+        self.assertEqual(
+            QuizState.fromScript(result).getThisOrThatTarget(), "rqAnswerOption0"
+        )
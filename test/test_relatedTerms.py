@@ -0,0 +1,49 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.relatedTerms import RelatedTerms
+
+
+class TestRelatedTerms(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "related_terms.sqlite"
+
+    def waitFor(self, relatedTerms: RelatedTerms, term: str) -> list[str] | None:
+        for _ in range(100):
+            if (related := relatedTerms.get(term)) is not None:
+                return related
+            time.sleep(0.01)
+        return None
+
+    @patch.object(
+        RelatedTerms, "fetch", side_effect=lambda term: [term, f"{term} news"]
+    )
+    def test_prefetched_terms_are_cached(self, fetch):
+        with RelatedTerms(self.path, "agent", ttl=3600) as relatedTerms:
+            relatedTerms.prefetch(["foo", "bar"])
+            self.assertEqual(self.waitFor(relatedTerms, "foo"), ["foo", "foo news"])
+        with RelatedTerms(self.path, "agent", ttl=3600) as relatedTerms:
+            self.assertEqual(relatedTerms.get("foo"), ["foo", "foo news"])
+        self.assertEqual(fetch.call_count, 2)
+
+    @patch.object(
+        RelatedTerms, "fetch", side_effect=lambda term: [term, f"{term} news"]
+    )
+    def test_prefetched_terms_not_searched_are_cached_on_close(self, fetch):
+        with RelatedTerms(self.path, "agent", ttl=3600) as relatedTerms:
+            relatedTerms.prefetch(["foo", "bar"])
+            for future in list(relatedTerms.pending.values()):
+                future.result()
+        with RelatedTerms(self.path, "agent", ttl=3600) as relatedTerms:
+            self.assertEqual(relatedTerms.get("bar"), ["bar", "bar news"])
+        self.assertEqual(fetch.call_count, 2)
+
+    @patch.object(RelatedTerms, "fetch", side_effect=OSError)
+    def test_failed_fetch_falls_back_to_term(self, fetch):
+        with RelatedTerms(self.path, "agent", ttl=3600) as relatedTerms:
+            self.assertEqual(self.waitFor(relatedTerms, "foo"), ["foo"])
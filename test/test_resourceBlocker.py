@@ -0,0 +1,51 @@
+import json
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from src.resourceBlocker import ESTIMATED_SIZES, ResourceBlocker
+
+
+def performanceEntry(method: str, **params) -> dict:
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class TestResourceBlocker(TestCase):
+    def test_patterns_blocking_allowlist_are_dropped(self):
+        blocker = ResourceBlocker(
+            ["*.woff2", "*bing.com*", "*://bat.bing.com/*"],
+            [
+                "https://rewards.bing.com/",
+                "https://www.bing.com/rewardsapp/reportActivity",
+            ],
+        )
+        self.assertEqual(blocker.patterns, ["*.woff2", "*://bat.bing.com/*"])
+
+    def test_stats_are_collected_from_performance_log(self):
+        blocker = ResourceBlocker(["*.woff2"], [], collectsStats=True)
+        driver = MagicMock()
+        driver.get_log.return_value = [
+            performanceEntry(
+                "Network.requestWillBeSent",
+                requestId="1",
+                request={"url": "https://www.bing.com/font.woff2"},
+            ),
+            performanceEntry(
+                "Network.loadingFailed",
+                requestId="1",
+                type="Font",
+                blockedReason="inspector",
+            ),
+            performanceEntry(
+                "Network.requestWillBeSent",
+                requestId="2",
+                request={"url": "https://www.bing.com/"},
+            ),
+            performanceEntry(
+                "Network.loadingFinished", requestId="2", encodedDataLength=2048
+            ),
+        ]
+        blocker.collectStats(driver)
+        self.assertEqual(blocker.blockedByPattern, {"*.woff2": 1})
+        self.assertEqual(blocker.bytesSaved, ESTIMATED_SIZES["Font"])
+        self.assertEqual(blocker.bytesDownloaded, 2048)
+        self.assertEqual(blocker.pendingUrls, {})
@@ -0,0 +1,60 @@
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.runJournal import RunJournal
+from src.utils import Utils
+
+
+class TestRunJournal(TestCase):
+    def setUp(self):
+        temporaryDirectory = TemporaryDirectory()
+        self.addCleanup(temporaryDirectory.cleanup)
+        patcher = patch(
+            "src.utils.Utils.getProjectRoot",
+            return_value=Path(temporaryDirectory.name),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.day = date(2024, 9, 1)
+
+    def test_resume_picks_up_where_the_run_stopped(self):
+        journal = RunJournal.forAccount("someone@example.com", False, self.day)
+        journal.startingPoints = 1200
+        journal.markDone("desktopActivities")
+        journal.markTaskDone("DAILY_SET:Global_DailySet_1")
+
+        resumed = RunJournal.forAccount("someone@example.com", True, self.day)
+        self.assertEqual(resumed.startingPoints, 1200)
+        self.assertTrue(resumed.isDone("desktopActivities"))
+        self.assertFalse(resumed.isDone("desktopActivities", "desktopSearches"))
+        self.assertTrue(resumed.isTaskDone("DAILY_SET:Global_DailySet_1"))
+        self.assertFalse(resumed.finished)
+
+    def test_without_resume_the_run_starts_over(self):
+        journal = RunJournal.forAccount("someone@example.com", False, self.day)
+        journal.markDone("desktopActivities")
+        journal.markFinished()
+
+        fresh = RunJournal.forAccount("someone@example.com", False, self.day)
+        self.assertIsNone(fresh.startingPoints)
+        self.assertFalse(fresh.isDone("desktopActivities"))
+        self.assertFalse(fresh.finished)
+        self.assertFalse(
+            RunJournal.forAccount(
+                "someone@example.com", True, date(2024, 9, 2)
+            ).finished
+        )
+
+    def test_journals_of_previous_days_are_deleted(self):
+        RunJournal.forAccount("someone@example.com", False, self.day).save()
+        RunJournal.forAccount("someone@example.com", False, date(2024, 9, 2)).save()
+        self.assertEqual(
+            [
+                path.name
+                for path in (Utils.getProjectRoot() / "logs" / "journal").iterdir()
+            ],
+            ["2024-09-02_someone@example.com.json"],
+        )
@@ -0,0 +1,110 @@
+import json
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from src.searches import SearchCreditWatcher, Searches
+from src.trendsQueue import TrendsQueue
+from src.utils import Utils
+
+
+class TestSearches(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(Utils, "getCacheDir", return_value=Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.searches = Searches.__new__(Searches)
+        self.searches.browser = MagicMock(localeGeo="US", localeLang="en")
+        self.searches.googleTrendsQueue = TrendsQueue(Path(tmp.name) / "trends.sqlite")
+        self.addCleanup(self.searches.googleTrendsQueue.close)
+
+    @staticmethod
+    def trendsResponse(*queries: str) -> MagicMock:
+        trends = {
+            "default": {
+                "trendingSearchesDays": [
+                    {
+                        "trendingSearches": [
+                            {
+                                "title": {"query": query},
+                                "relatedQueries": [{"query": f"{query} News"}],
+                            }
+                            for query in queries
+                        ]
+                    }
+                ]
+            }
+        }
+        return MagicMock(status_code=200, text=")]}',\n" + json.dumps(trends))
+
+    def test_day_of_trends_is_cached(self):
+        session = MagicMock()
+        session.get.return_value = self.trendsResponse("Foo", "Bar")
+        day = date(2024, 1, 1)
+        expected = ["foo", "foo news", "bar", "bar news"]
+        self.assertEqual(self.searches.getGoogleTrendsOfDay(session, day), expected)
+        self.assertEqual(self.searches.getGoogleTrendsOfDay(session, day), expected)
+        session.get.assert_called_once()
+
+    def test_load_fills_queue_without_duplicates(self):
+        with patch.object(
+            Searches,
+            "getGoogleTrendsOfDay",
+            side_effect=lambda session, day: ["a", "b"],
+        ):
+            self.searches.loadGoogleTrends(2)
+        self.assertEqual(sorted(self.searches.googleTrendsQueue), ["a", "b"])
+
+    def test_days_outside_the_batch_are_pruned(self):
+        names = {
+            daysAgo: f"google_trends_US_en_{(date.today() - timedelta(days=daysAgo)).strftime('%Y%m%d')}"
+            for daysAgo in (1, 4, 5, 30)
+        }
+        for name in [*names.values(), "related_terms"]:
+            Utils.saveCache(name, [])
+        with patch.object(
+            Searches, "getGoogleTrendsOfDay", side_effect=lambda session, day: ["a"]
+        ):
+            self.searches.loadGoogleTrends(1)
+        self.assertEqual(
+            sorted(path.stem for path in Utils.getCacheDir().glob("*.json")),
+            sorted([names[1], names[4], "related_terms"]),
+        )
+
+    def test_credit_watcher_reads_points_once_per_attempt(self):
+        browser = MagicMock()
+        browser.webdriver = MagicMock(spec=["requests", "wait_for_request"])
+        browser.webdriver.requests = []
+        browser.utils.getAccountPoints.side_effect = [100, 100, 105]
+        watcher = SearchCreditWatcher(browser)
+
+        watcher.beforeAttempt()
+        browser.webdriver.requests = []
+        self.assertFalse(watcher.wasCredited())
+        watcher.beforeAttempt()
+        browser.webdriver.requests = [
+            MagicMock(url="https://www.bing.com/rewardsapp/reportActivity?IG=1")
+        ]
+        self.assertTrue(watcher.wasCredited())
+        self.assertEqual(browser.utils.getAccountPoints.call_count, 3)
+        # The second report was already captured, no need to wait for it
+        browser.webdriver.wait_for_request.assert_called_once()
+
+    def test_load_walks_back_past_days_already_queued(self):
+        self.searches.googleTrendsQueue.extend(["a", "b"])
+        days = []
+
+        def getGoogleTrendsOfDay(session, day):
+            days.append(day)
+            return ["a", "b"] if len(days) <= 8 else [f"term {len(days)}"]
+
+        with patch.object(
+            Searches, "getGoogleTrendsOfDay", side_effect=getGoogleTrendsOfDay
+        ):
+            self.searches.loadGoogleTrends(4)
+        self.assertEqual(len(self.searches.googleTrendsQueue), 6)
+        self.assertEqual(min(days), date.today() - timedelta(days=12))
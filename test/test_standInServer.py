@@ -0,0 +1,65 @@
+import tempfile
+from datetime import date
+from pathlib import Path
+from test.standInServer import StandInServer
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import requests
+from src.constants import rewriteUrl
+from src.searches import Searches
+from src.userAgentGenerator import GenerateUserAgent
+from src.utils import Utils
+
+
+class TestStandInServer(TestCase):
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.addCleanup(self.server.stop)
+        patcher = patch("src.constants.STAND_IN_URL", self.server.url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(Utils, "getCacheDir", return_value=Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = requests.Session()
+        self.addCleanup(self.session.close)
+
+    def test_urls_are_rewritten(self):
+        self.assertEqual(
+            rewriteUrl("https://rewards.bing.com/api/getuserinfo?type=1"),
+            f"{self.server.url}/rewards.bing.com/api/getuserinfo?type=1",
+        )
+
+    def test_releases_are_replayed(self):
+        generator = GenerateUserAgent(self.session)
+        windowsVersion, androidVersion = generator.getEdgeVersions()
+        self.assertTrue(windowsVersion)
+        self.assertTrue(androidVersion)
+        self.assertTrue(generator.getChromeVersion())
+
+    def test_google_trends_are_replayed(self):
+        searches = Searches.__new__(Searches)
+        searches.browser = MagicMock(localeGeo="US", localeLang="en")
+        searchTerms = searches.getGoogleTrendsOfDay(self.session, date(2024, 1, 2))
+        self.assertTrue(searchTerms)
+        self.assertTrue(all("20240102" in term for term in searchTerms))
+
+    def test_searches_are_credited(self):
+        def pcSearchProgress() -> int:
+            response = self.session.get(
+                rewriteUrl("https://rewards.bing.com/api/getuserinfo?type=1")
+            )
+            return response.json()["dashboard"]["userStatus"]["counters"]["pcSearch"][
+                0
+            ]["pointProgress"]
+
+        before = pcSearchProgress()
+        self.session.get(rewriteUrl("https://www.bing.com/search?q=weather"))
+        self.assertEqual(pcSearchProgress(), before + 3)
+        self.assertEqual(
+            [(r.host, r.path) for r in self.server.requests][1],
+            ("www.bing.com", "/search"),
+        )
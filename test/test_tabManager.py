@@ -0,0 +1,53 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from selenium.common import TimeoutException
+from src.tabManager import TabManager
+
+
+class FakeWebdriver:
+    """Just enough of a WebDriver to open, switch and close tabs."""
+
+    def __init__(self):
+        self.handles = ["main"]
+        self.current_window_handle = "main"
+        self.switch_to = MagicMock()
+        self.switch_to.window.side_effect = self.switchTo
+
+    @property
+    def window_handles(self) -> list[str]:
+        return list(self.handles)
+
+    def switchTo(self, handle: str) -> None:
+        self.current_window_handle = handle
+
+    def close(self) -> None:
+        self.handles.remove(self.current_window_handle)
+
+
+class TestTabManager(TestCase):
+    def setUp(self):
+        self.webdriver = FakeWebdriver()
+        self.tabs = TabManager(self.webdriver)
+
+    def test_switches_to_the_new_tab_once_opened(self):
+        self.webdriver.handles.append("activity")
+        self.assertEqual(self.tabs.switchToNewTab(1), "activity")
+        self.assertEqual(self.webdriver.current_window_handle, "activity")
+
+        self.tabs.closeCurrentTab()
+        self.assertEqual(self.webdriver.window_handles, ["main"])
+        self.assertEqual(self.webdriver.current_window_handle, "main")
+
+    def test_no_new_tab_times_out(self):
+        with self.assertRaises(TimeoutException):
+            self.tabs.switchToNewTab(0.2)
+
+    def test_other_tabs_are_closed(self):
+        self.tabs.getMainHandle()
+        self.webdriver.handles += ["activity", "popup"]
+        self.tabs.switchToNewTab()
+        self.tabs.closeOtherTabs()
+        self.assertEqual(self.webdriver.window_handles, ["main"])
+        self.assertEqual(self.webdriver.current_window_handle, "main")
+        self.assertEqual(self.tabs.openedHandles, [])
@@ -0,0 +1,52 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.tracer import Tracer
+
+
+class TestTracer(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.traceFile = Path(tmp.name) / "trace.jsonl"
+        for name, value in (
+            ("spans", []),
+            ("context", {"account": "foo@bar.com"}),
+            ("traceFile", self.traceFile),
+        ):
+            patcher = patch.object(Tracer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_spans_are_recorded_and_written(self):
+        @Tracer.traced
+        def completeSomething():
+            raise ValueError
+
+        with Tracer.span("login"):
+            pass
+        with self.assertRaises(ValueError):
+            completeSomething()
+
+        lines = [json.loads(line) for line in self.traceFile.read_text().splitlines()]
+        self.assertEqual(
+            [line["name"] for line in lines], ["login", completeSomething.__qualname__]
+        )
+        self.assertEqual(lines[0]["account"], "foo@bar.com")
+        self.assertEqual(lines[1]["error"], "ValueError")
+        self.assertIn("login", Tracer.getSummary())
+
+    def test_trace_file_is_rotated_per_run(self):
+        for run in range(4):
+            Tracer.setTraceFile(self.traceFile)
+            with Tracer.span(f"run {run}"):
+                pass
+        self.assertEqual(
+            sorted(path.name for path in self.traceFile.parent.iterdir()),
+            ["trace.jsonl", "trace.jsonl.1", "trace.jsonl.2"],
+        )
+        self.assertIn('"run 3"', self.traceFile.read_text())
+        self.assertIn('"run 1"', self.traceFile.with_name("trace.jsonl.2").read_text())
@@ -0,0 +1,34 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from src.trendsQueue import TrendsQueue
+
+
+class TestTrendsQueue(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "google_trends.sqlite"
+        self.queue = TrendsQueue(self.path)
+        self.addCleanup(self.queue.close)
+
+    def test_fifo_with_dedup(self):
+        self.assertEqual(self.queue.extend(["a", "b", "a", "c"]), 3)
+        self.assertEqual(self.queue.extend(["b", "d"]), 1)
+        self.assertEqual(list(self.queue), ["a", "b", "c", "d"])
+        self.assertEqual(self.queue.peek(), "a")
+        self.queue.remove("a")
+        self.assertEqual(self.queue.peek(), "b")
+        self.assertEqual(len(self.queue), 3)
+
+    def test_rotate_and_persistence(self):
+        self.queue.extend(["a", "b", "c"])
+        self.queue.rotate("a")
+        self.queue.close()
+        with TrendsQueue(self.path) as reopened:
+            self.assertEqual(list(reopened), ["b", "c", "a"])
+
+    def test_empty(self):
+        self.assertIsNone(self.queue.peek())
+        self.assertEqual(len(self.queue), 0)
@@ -0,0 +1,42 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from src.userAgentGenerator import GenerateUserAgent
+from src.utils import Utils
+
+
+class TestGenerateUserAgent(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(Utils, "getCacheDir", return_value=Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cached_release_is_fetched_once(self):
+        generator = GenerateUserAgent(MagicMock())
+        fetch = MagicMock(return_value="120.0.0.0")
+        self.assertEqual(
+            generator.getCachedRelease("chrome_version", fetch), "120.0.0.0"
+        )
+        self.assertEqual(
+            generator.getCachedRelease("chrome_version", fetch), "120.0.0.0"
+        )
+        fetch.assert_called_once()
+
+    def test_stale_release_is_returned_while_refreshing(self):
+        generator = GenerateUserAgent(MagicMock())
+        generator.getCachedRelease("chrome_version", MagicMock(return_value="1.0.0.0"))
+        generator.releasesCacheTtl = 0
+        fetch = MagicMock(return_value="2.0.0.0")
+        self.assertEqual(generator.getCachedRelease("chrome_version", fetch), "1.0.0.0")
+        for _ in range(50):
+            if generator.loadReleasesCache()["chrome_version"]["value"] == "2.0.0.0":
+                break
+            time.sleep(0.01)
+        self.assertEqual(
+            generator.loadReleasesCache()["chrome_version"]["value"], "2.0.0.0"
+        )
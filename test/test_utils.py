@@ -1,6 +1,11 @@
+import re
+import time
 from argparse import Namespace
+from pathlib import Path
 from unittest import TestCase
+from unittest.mock import MagicMock
 
+from src.constants import REWARDS_URL
 from src.utils import Utils
 
 
@@ -9,3 +14,56 @@ class TestUtils(TestCase):
         Utils.args = Namespace()
         Utils.args.disable_apprise = False
         Utils.sendNotification("title", "body")
+
+    def test_dashboard_data_is_cached_until_invalidated(self):
+        webdriver = MagicMock()
+        webdriver.current_url = REWARDS_URL
+        webdriver.execute_script.return_value = {"userStatus": {}}
+        utils = Utils(webdriver)
+
+        utils.getDashboardData()
+        utils.getDashboardData()
+        self.assertEqual(webdriver.execute_script.call_count, 1)
+
+        utils.invalidateDashboardData()
+        utils.getDashboardData()
+        utils.getDashboardData(refresh=True)
+        self.assertEqual(webdriver.execute_script.call_count, 3)
+
+    def test_cookies_are_synced_incrementally(self):
+        webdriver = MagicMock()
+        webdriver.execute_cdp_cmd.return_value = {
+            "cookies": [
+                {"name": "a", "value": "1", "domain": ".bing.com", "path": "/"},
+                {"name": "b", "value": "2", "domain": "rewards.bing.com", "path": "/"},
+            ]
+        }
+        utils = Utils(webdriver)
+        session = utils.getRequestsSessionWithCookies()
+        self.assertEqual(session.cookies.get("a", domain=".bing.com"), "1")
+
+        webdriver.execute_cdp_cmd.return_value = {
+            "cookies": [{"name": "a", "value": "3", "domain": ".bing.com", "path": "/"}]
+        }
+        self.assertIs(utils.getRequestsSessionWithCookies(), session)
+        self.assertEqual(session.cookies.get("a", domain=".bing.com"), "3")
+        self.assertIsNone(session.cookies.get("b", domain="rewards.bing.com"))
+
+    def test_text_present_returns_without_waiting_full_delay(self):
+        webdriver = MagicMock()
+        webdriver.page_source = "<p>Help us protect your account</p>"
+        utils = Utils(webdriver)
+        start = time.monotonic()
+        self.assertTrue(utils.checkIfTextPresentAfterDelay("protect your account", 5))
+        self.assertLess(time.monotonic() - start, 1)
+
+        webdriver.page_source = "<p>Welcome</p>"
+        self.assertFalse(utils.checkIfTextPresentAfterDelay("protect your account", 0.1))
+
+    def test_answer_codes_of_quiz_fixture(self):
+        quiz = (Path(__file__).parent / "fixtures" / "quiz.html").read_text(encoding="utf-8")
+        key = re.search(r'_G = \{IG: "(\w+)"\}', quiz).group(1)
+        titles = re.findall(r'data-option="([^"]*)"', quiz)
+        self.assertEqual(key, "ABCDEF0123456789AB")
+        self.assertEqual(Utils.getAnswerCodes(key, titles), ["566", "237", "238", "239"])
+        self.assertEqual(Utils.getAnswerCode(key, "Cats"), "566")